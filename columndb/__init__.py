@@ -2,7 +2,7 @@
 ColumnDB: Python-first API for columnar database with C backend
 """
 
-from typing import Any, List, Optional, Dict, Union
+from typing import Any, Callable, List, Optional, Dict, Sequence, Tuple, Union
 import os
 
 try:
@@ -11,6 +11,14 @@ try:
 except ImportError:
     HAS_C_EXTENSION = False
 
+# Optional compiled insert dispatcher; set COLUMNDB_USE_CYTHON=0 to use pure Python
+_InsertDispatcher = None
+if os.environ.get("COLUMNDB_USE_CYTHON", "1") != "0":
+    try:
+        from ._wrapper import InsertDispatcher as _InsertDispatcher
+    except ImportError:
+        pass
+
 
 class DataType:
     """Enumeration of supported data types"""
@@ -20,6 +28,73 @@ class DataType:
     FLOAT64 = 3
     STRING = 4
     BOOL = 5
+    STRING_DICT = 6  # dictionary-encoded STRING for low-cardinality text
+
+
+# C extension single-value insert entrypoint for each data type, taking
+# the column id from get_column_id() rather than the column name
+_INSERT_METHODS = {
+    DataType.INT32: "insert_int32_by_id",
+    DataType.INT64: "insert_int64_by_id",
+    DataType.FLOAT32: "insert_float32_by_id",
+    DataType.FLOAT64: "insert_float64_by_id",
+    DataType.STRING: "insert_string_by_id",
+    DataType.BOOL: "insert_bool_by_id",
+    DataType.STRING_DICT: "insert_string_by_id",
+}
+
+# Python coercion applied to a value before it is handed to the C extension
+_COERCE_FUNCTIONS = {
+    DataType.INT32: int,
+    DataType.INT64: int,
+    DataType.FLOAT32: float,
+    DataType.FLOAT64: float,
+    DataType.STRING: str,
+    DataType.BOOL: bool,
+    DataType.STRING_DICT: str,
+}
+
+# C extension bulk-insert entrypoint for each data type
+_INSERT_MANY_METHODS = {
+    DataType.INT32: "insert_many_int32",
+    DataType.INT64: "insert_many_int64",
+    DataType.FLOAT32: "insert_many_float32",
+    DataType.FLOAT64: "insert_many_float64",
+    DataType.STRING: "insert_many_string",
+    DataType.BOOL: "insert_many_bool",
+    DataType.STRING_DICT: "insert_many_string",
+}
+
+# NumPy dtype matching the C storage of each fixed-width data type
+_NUMPY_DTYPES = {
+    DataType.INT32: "int32",
+    DataType.INT64: "int64",
+    DataType.FLOAT32: "float32",
+    DataType.FLOAT64: "float64",
+    DataType.BOOL: "bool",
+}
+
+
+def _bitmap_to_bool(bitmap: bytes, length: int):
+    """Expand a packed NULL bitmap (bit i set = row i is NULL) to a bool array."""
+    import numpy as np
+    
+    return np.unpackbits(
+        np.frombuffer(bitmap, dtype=np.uint8), count=length, bitorder="little"
+    ).view(bool)
+
+
+class _ArrowColumn:
+    """A column exported through the Arrow PyCapsule interface."""
+    
+    __slots__ = ("_db", "_name")
+    
+    def __init__(self, db: Any, name: str):
+        self._db = db
+        self._name = name
+    
+    def __arrow_c_array__(self, requested_schema: Any = None) -> Tuple[Any, Any]:
+        return self._db.export_arrow(self._name)
 
 
 class ColumnDB:
@@ -51,6 +126,9 @@ class ColumnDB:
         
         Args:
             filename: Optional path to load from or save to
+        
+        Raises:
+            OSError: If filename exists but cannot be loaded
         """
         if not HAS_C_EXTENSION:
             raise RuntimeError(
@@ -58,12 +136,36 @@ class ColumnDB:
                 "Please build the extension with: python setup.py build_ext --inplace"
             )
         
+        self._init_state(filename)
+        
+        # A missing file just means a new database that will be saved there
+        if filename:
+            try:
+                self._load_file(filename)
+            except FileNotFoundError:
+                pass
+    
+    def _init_state(self, filename: Optional[str]) -> None:
+        """Create empty C state and the per-column dispatch tables."""
         self._db = _columndb.ColumnDB()
         self._columns: Dict[str, int] = {}  # name -> type mapping
+        self._column_ids: Dict[str, int] = {}  # name -> C column id
+        self._insert_fn: Dict[str, Callable[[int, Any], None]] = {}  # name -> C insert method
+        self._coerce_fn: Dict[str, Callable[[Any], Any]] = {}  # name -> value coercion
+        self._data_cache: Dict[str, Tuple[int, memoryview]] = {}  # name -> (rows, buffer)
         self._filename = filename
+        self._bind_fast_insert()
+    
+    def _load_file(self, filename: str) -> None:
+        """Load a .cdb file into this (empty) database and register its columns."""
+        # Raises FileNotFoundError for a missing file and OSError otherwise
+        self._db.load(filename)
         
-        if filename and os.path.exists(filename):
-            self.load(filename)
+        # Rebuild the column tracking from the loaded schema so the
+        # loaded columns can be appended to (which copies them out of
+        # the mapped file on first write)
+        for name, data_type in zip(self._db.get_column_names(), self._db.get_column_types()):
+            self._register_column(name, data_type)
     
     def add_column(self, name: str, data_type: int) -> None:
         """
@@ -80,14 +182,82 @@ class ColumnDB:
         if name in self._columns:
             raise ValueError(f"Column '{name}' already exists")
         
-        if data_type < DataType.INT32 or data_type > DataType.BOOL:
+        if data_type < DataType.INT32 or data_type > DataType.STRING_DICT:
             raise ValueError(f"Invalid data type: {data_type}")
         
         try:
             self._db.add_column(name, data_type)
-            self._columns[name] = data_type
         except RuntimeError as e:
             raise RuntimeError(f"Failed to add column: {e}")
+        
+        self._register_column(name, data_type)
+    
+    def add_columns(self, schema: Sequence[Tuple[str, int]]) -> None:
+        """
+        Add several columns at once.
+        
+        The C backend grows its column table a single time for the whole
+        schema, and either all columns are added or none are.
+        
+        Args:
+            schema: Sequence of (name, data_type) pairs
+            
+        Raises:
+            ValueError: If a column name is repeated or already exists, or a
+                type is invalid
+            RuntimeError: If C extension fails
+        """
+        schema = list(schema)
+        seen = set(self._columns)
+        for name, data_type in schema:
+            if name in seen:
+                raise ValueError(f"Column '{name}' already exists")
+            if data_type < DataType.INT32 or data_type > DataType.STRING_DICT:
+                raise ValueError(f"Invalid data type: {data_type}")
+            seen.add(name)
+        
+        try:
+            self._db.add_columns(schema)
+        except RuntimeError as e:
+            raise RuntimeError(f"Failed to add columns: {e}")
+        
+        for name, data_type in schema:
+            self._register_column(name, data_type)
+    
+    def _bind_fast_insert(self) -> None:
+        """Route insert() through the compiled dispatcher when it is available."""
+        # A subclass that overrides insert() keeps its own method
+        if _InsertDispatcher is not None and type(self).insert is ColumnDB.insert:
+            dispatcher = _InsertDispatcher(
+                self._column_ids, self._insert_fn, self._coerce_fn, self._db.insert_null_by_id
+            )
+            self.insert = dispatcher.insert
+    
+    def _register_column(self, name: str, data_type: int) -> None:
+        """Record a column's type and id and bind its insert dispatch entries."""
+        self._columns[name] = data_type
+        self._column_ids[name] = self._db.get_column_id(name)
+        self._insert_fn[name] = getattr(self._db, _INSERT_METHODS[data_type])
+        self._coerce_fn[name] = _COERCE_FUNCTIONS[data_type]
+    
+    def reserve(self, num_rows: int, column_name: Optional[str] = None) -> None:
+        """
+        Pre-allocate storage for num_rows rows.
+        
+        Columns grow geometrically on their own; reserving up front when the
+        final row count is known avoids the intermediate reallocations.
+        
+        Args:
+            num_rows: Total number of rows each column should be able to hold
+            column_name: Only reserve for this column (default: all columns)
+            
+        Raises:
+            ValueError: If column doesn't exist or num_rows is negative
+        """
+        if column_name is not None and column_name not in self._columns:
+            raise ValueError(f"Column '{column_name}' does not exist")
+        
+        self._db.reserve(num_rows, column_name)
     
     def insert(self, column_name: str, value: Any) -> None:
         """
@@ -101,47 +271,211 @@ class ColumnDB:
             ValueError: If column doesn't exist or type mismatch
             RuntimeError: If C extension fails
         """
+        fn = self._insert_fn.get(column_name)
+        if fn is None:
+            raise ValueError(f"Column '{column_name}' does not exist")
+        
+        column_id = self._column_ids[column_name]
+        if value is None:
+            self._db.insert_null_by_id(column_id)
+        else:
+            fn(column_id, self._coerce_fn[column_name](value))
+    
+    def compile_row_inserter(self, column_order: Sequence[str]) -> Callable[[Sequence[Any]], None]:
+        """
+        Build a function that inserts one row at a time for a fixed column order.
+        
+        The returned callable is generated for this schema: each column's
+        C insert method and coercion are bound up front, so inserting a row
+        does no dictionary lookups or type dispatch. Prefer insert_many()
+        when the data is already available column-wise.
+        
+        Args:
+            column_order: Column names, in the order values appear in a row
+            
+        Returns:
+            Callable taking a sequence of values (None for NULL)
+            
+        Raises:
+            ValueError: If a column doesn't exist
+        
+        Example:
+            >>> insert_row = db.compile_row_inserter(["id", "name"])
+            >>> for row in rows:
+            ...     insert_row(row)
+        """
+        column_order = list(column_order)
+        namespace: Dict[str, Any] = {"_insert_null": self._db.insert_null_by_id}
+        lines = []
+        for i, name in enumerate(column_order):
+            if name not in self._columns:
+                raise ValueError(f"Column '{name}' does not exist")
+            column_id = self._column_ids[name]
+            namespace[f"_insert_{i}"] = self._insert_fn[name]
+            namespace[f"_coerce_{i}"] = self._coerce_fn[name]
+            lines.append(
+                f"    if v{i} is None: _insert_null({column_id})\n"
+                f"    else: _insert_{i}({column_id}, _coerce_{i}(v{i}))\n"
+            )
+        
+        # Unpacking checks the row length as well as binding each value to a local
+        targets = "".join(f"v{i}, " for i in range(len(column_order)))
+        source = f"def _insert_row(row):\n    ({targets}) = row\n" + "".join(lines)
+        exec(source, namespace)
+        return namespace["_insert_row"]
+    
+    def insert_many(self, column_name: str, values: Sequence[Any]) -> None:
+        """
+        Append a sequence of values to a column in a single C call.
+        
+        Values are coerced like insert() does (None becomes NULL). Every
+        value is converted before any is written, so if one fails to
+        convert, none of the values are inserted.
+        
+        Args:
+            column_name: Name of the column
+            values: Sequence (or iterable) of values to append
+            
+        Raises:
+            ValueError: If column doesn't exist
+            TypeError: If a value cannot be converted to the column type
+        """
+        if column_name not in self._columns:
+            raise ValueError(f"Column '{column_name}' does not exist")
+        
+        insert_many = getattr(self._db, _INSERT_MANY_METHODS[self._columns[column_name]])
+        insert_many(column_name, values)
+    
+    def insert_array(self, column_name: str, values: Any) -> None:
+        """
+        Append a NumPy array (or array-like) to a numeric or bool column.
+        
+        This is the fastest way to load numeric data: the array is converted
+        to the column's native dtype once and its buffer is copied into the
+        column with a single memcpy, with no per-value Python conversion.
+        NULLs are not supported here; use insert_many() for those.
+        
+        Args:
+            column_name: Name of the column
+            values: 1-D array-like of values
+            
+        Raises:
+            ValueError: If column doesn't exist, is a string column, or
+                values is not one-dimensional
+            TypeError: If the array's dtype is not the column's kind
+            OverflowError: If a value is out of range for the column type
+            ImportError: If numpy is not installed
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("numpy is required for insert_array()")
+        
         if column_name not in self._columns:
             raise ValueError(f"Column '{column_name}' does not exist")
         
         data_type = self._columns[column_name]
+        if data_type not in _NUMPY_DTYPES:
+            raise ValueError(
+                f"Column '{column_name}' is not numeric; use insert_many() instead"
+            )
         
-        if value is None:
-            self._db.insert_null(column_name)
-        elif data_type == DataType.INT32:
-            self._db.insert_int32(column_name, int(value))
-        elif data_type == DataType.INT64:
-            self._db.insert_int64(column_name, int(value))
-        elif data_type == DataType.FLOAT32:
-            self._db.insert_float32(column_name, float(value))
-        elif data_type == DataType.FLOAT64:
-            self._db.insert_float64(column_name, float(value))
-        elif data_type == DataType.STRING:
-            self._db.insert_string(column_name, str(value))
-        elif data_type == DataType.BOOL:
-            self._db.insert_bool(column_name, bool(value))
-        else:
-            raise ValueError(f"Unknown data type: {data_type}")
+        dtype = np.dtype(_NUMPY_DTYPES[data_type])
+        arr = np.asarray(values)
+        if arr.ndim != 1:
+            raise ValueError("insert_array() expects a one-dimensional array")
+        if not np.can_cast(arr.dtype, dtype, casting="same_kind"):
+            raise TypeError(f"Cannot cast array of {arr.dtype} to {dtype}")
+        if arr.size and not np.can_cast(arr.dtype, dtype, casting="safe"):
+            # Narrowing within the same kind (int64 -> int32, float64 -> float32)
+            # is only allowed when every value fits, like insert_many()
+            limits = np.iinfo(dtype) if dtype.kind == "i" else np.finfo(dtype)
+            finite = arr if dtype.kind == "i" else arr[np.isfinite(arr)]
+            if finite.size and (finite.min() < limits.min or finite.max() > limits.max):
+                raise OverflowError(f"value out of range for {dtype}")
+
+        arr = np.ascontiguousarray(arr, dtype=dtype)
+        self._db.insert_buffer(column_name, data_type, arr)
     
-    def get_column_data(self, column_name: str) -> List[Any]:
+    def get_column_data(self, column_name: str, as_buffer: bool = False) -> Union[List[Any], memoryview]:
         """
         Retrieve all data from a column as a list.
         
         Args:
             column_name: Name of the column
+            as_buffer: If True, return a read-only typed memoryview over a
+                snapshot of the column's raw storage instead of a list
+                (numeric and bool columns only; NULL entries read as 0).
+                Wrap it with numpy.asarray() for a zero-copy array.
             
         Returns:
-            List of values in the column (None for NULL values)
+            List of values in the column (None for NULL values), or a
+            memoryview when as_buffer is True
             
         Raises:
             ValueError: If column doesn't exist
+            TypeError: If as_buffer is True for a string column
         """
-        # Try to get the data from the C extension
-        # This will raise an error if the column doesn't exist
-        try:
-            return self._db.get_column_data(column_name)
-        except RuntimeError as e:
-            raise ValueError(f"Column '{column_name}' does not exist: {e}")
+        if column_name not in self._columns:
+            raise ValueError(f"Column '{column_name}' does not exist")
+        
+        if as_buffer:
+            return self._get_column_buffer(column_name)
+        return self._db.get_column_data(column_name)
+    
+    def _get_column_buffer(self, column_name: str) -> memoryview:
+        """Get a column buffer, reusing the cached snapshot if the column hasn't grown."""
+        # Columns are append-only, so a snapshot stays valid until the row count changes
+        num_rows = self._db.get_column_length(column_name)
+        cached = self._data_cache.get(column_name)
+        if cached is None or cached[0] != num_rows:
+            cached = (num_rows, self._db.get_column_buffer(column_name))
+            self._data_cache[column_name] = cached
+        # Hand out a fresh view so callers releasing it don't affect the cache
+        return memoryview(cached[1])
+    
+    def count_nulls(self, column_name: str) -> int:
+        """
+        Count the NULL values in a column.
+        
+        Reads the column's NULL bitmap 64 rows at a time instead of building
+        a list and checking each value.
+        
+        Args:
+            column_name: Name of the column
+            
+        Returns:
+            Number of NULL values in the column
+            
+        Raises:
+            ValueError: If column doesn't exist
+        """
+        if column_name not in self._columns:
+            raise ValueError(f"Column '{column_name}' does not exist")
+        
+        return self._db.count_nulls(column_name)
+    
+    def count_true(self, column_name: str) -> int:
+        """
+        Count the TRUE values in a bool column.
+        
+        Bool columns are stored one bit per row, so this is a popcount over
+        64-row words. NULL values are not counted.
+        
+        Args:
+            column_name: Name of a bool column
+            
+        Returns:
+            Number of TRUE values in the column
+            
+        Raises:
+            ValueError: If column doesn't exist
+            TypeError: If the column is not a bool column
+        """
+        if column_name not in self._columns:
+            raise ValueError(f"Column '{column_name}' does not exist")
+        
+        return self._db.count_true(column_name)
     
     def get_num_rows(self) -> int:
         """Get the number of rows in the database."""
@@ -165,6 +499,7 @@ class ColumnDB:
             DataType.FLOAT64: "float64",
             DataType.STRING: "string",
             DataType.BOOL: "bool",
+            DataType.STRING_DICT: "string_dict",
         }
         
         # Use _columns dict if it's populated (database created in this session)
@@ -187,13 +522,10 @@ class ColumnDB:
             filename: Path to save to (e.g., "data.cdb")
             
         Raises:
-            RuntimeError: If save fails
+            OSError: If the file cannot be written
         """
         self._filename = filename
-        try:
-            self._db.save(filename)
-        except RuntimeError as e:
-            raise RuntimeError(f"Failed to save database: {e}")
+        self._db.save(filename)
     
     @classmethod
     def load(cls, filename: str) -> 'ColumnDB':
@@ -207,29 +539,13 @@ class ColumnDB:
             ColumnDB instance loaded from file
             
         Raises:
-            RuntimeError: If load fails
+            FileNotFoundError: If the file doesn't exist
+            OSError: If the file cannot be read or is not a valid .cdb file
         """
-        # Create a new empty instance
         instance = cls.__new__(cls)
-        instance._filename = filename
-        instance._columns = {}
-        
-        # Create C extension object and call load on it
-        try:
-            db_ext = _columndb.ColumnDB()
-            db_ext.load(filename)
-            instance._db = db_ext
-            
-            # Rebuild the _columns tracking dict
-            # We need to iterate through columns and add them
-            num_cols = db_ext.get_num_columns()
-            # Note: Since C extension doesn't expose column names through get_column_data,
-            # we can't rebuild _columns accurately. For now, just use the C extension directly.
-            instance._columns = {}
-            
-            return instance
-        except RuntimeError as e:
-            raise RuntimeError(f"Failed to load database: {e}")
+        instance._init_state(filename)
+        instance._load_file(filename)
+        return instance
     
     def to_dict(self) -> Dict[str, List[Any]]:
         """
@@ -238,28 +554,18 @@ class ColumnDB:
         Returns:
             Dictionary mapping column names to lists of values
         """
-        result = {}
-        
-        # Try to get column names from the C extension if available
-        if hasattr(self._db, 'get_column_names'):
-            column_names = self._db.get_column_names()
-        else:
-            # Fall back to using _columns dict
-            column_names = list(self._columns.keys())
-        
-        for col_name in column_names:
-            try:
-                result[col_name] = self.get_column_data(col_name)
-            except (ValueError, RuntimeError):
-                # Skip columns that can't be retrieved
-                pass
-        
-        return result
+        # One C call builds every column
+        return self._db.get_all_columns(False)
     
     def to_pandas(self):
         """
         Convert the database to a pandas DataFrame.
         
+        Numeric and bool columns are built from raw column buffers rather
+        than lists of Python objects. Columns containing NULLs use pandas'
+        nullable dtypes (Int32, Int64, Float32, Float64, boolean), and
+        STRING_DICT columns become pandas Categoricals.
+        
         Returns:
             pandas.DataFrame with all data
             
@@ -270,8 +576,61 @@ class ColumnDB:
             import pandas as pd
         except ImportError:
             raise ImportError("pandas is required for to_pandas()")
+        import numpy as np
+        
+        # Masked array type for each buffer format, used when a column has NULLs
+        masked_arrays = {
+            "i": pd.arrays.IntegerArray,
+            "q": pd.arrays.IntegerArray,
+            "f": pd.arrays.FloatingArray,
+            "d": pd.arrays.FloatingArray,
+            "?": pd.arrays.BooleanArray,
+        }
+        
+        data = {}
+        for col_name, (values, nulls) in self._db.get_all_columns(True).items():
+            if isinstance(values, memoryview):
+                # Each buffer is a fresh copy owned by us, so wrap it without copying again
+                arr = np.frombuffer(values, dtype=values.format)
+                if nulls is not None:
+                    arr = masked_arrays[values.format](arr, _bitmap_to_bool(nulls, len(arr)))
+                data[col_name] = arr
+            elif isinstance(values, tuple):
+                # Dictionary-encoded column: codes map straight onto a Categorical
+                codes, categories = values
+                codes = np.frombuffer(codes, dtype=np.uint32).astype(np.int32)
+                if nulls is not None:
+                    codes[_bitmap_to_bool(nulls, len(codes))] = -1
+                data[col_name] = pd.Categorical.from_codes(codes, categories)
+            else:
+                data[col_name] = values
+        
+        # copy=False keeps the arrays above as the DataFrame's storage
+        return pd.DataFrame(data, copy=False)
+    
+    def to_arrow(self):
+        """
+        Convert the database to a pyarrow Table.
+        
+        Each column is exported through the Arrow C Data Interface: its
+        values are copied once from the C column into Arrow-owned buffers,
+        with no per-value Python objects. STRING columns become
+        large_string and STRING_DICT columns become dictionary arrays.
+        
+        Returns:
+            pyarrow.Table with all data
+            
+        Requires:
+            pyarrow library (14.0 or newer) to be installed
+        """
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("pyarrow is required for to_arrow()")
         
-        return pd.DataFrame(self.to_dict())
+        names = self._db.get_column_names()
+        arrays = [pa.array(_ArrowColumn(self._db, name)) for name in names]
+        return pa.Table.from_arrays(arrays, names=names)
     
     def __repr__(self) -> str:
         """String representation of the database."""
@@ -0,0 +1,41 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled insert dispatch for ColumnDB.
+
+ColumnDB.insert() is called once per cell, so the Python-level attribute
+lookups and dict accesses in it dominate row-by-row loading. This module
+provides the same dispatch as a typed extension class; ColumnDB binds its
+insert() to it when the module has been built.
+"""
+
+cdef class InsertDispatcher:
+    """
+    Per-column insert dispatch backed by a ColumnDB's lookup tables.
+    
+    The tables are shared, not copied, so columns added to the ColumnDB
+    afterwards are visible here immediately.
+    """
+    
+    cdef dict _column_ids
+    cdef dict _insert_fn
+    cdef dict _coerce_fn
+    cdef object _insert_null
+    
+    def __cinit__(self, dict column_ids not None, dict insert_fn not None,
+                  dict coerce_fn not None, object insert_null):
+        self._column_ids = column_ids
+        self._insert_fn = insert_fn
+        self._coerce_fn = coerce_fn
+        self._insert_null = insert_null
+    
+    cpdef insert(self, object column_name, object value):
+        """Insert a value into a column (None inserts NULL)."""
+        cdef object fn = self._insert_fn.get(column_name)
+        if fn is None:
+            raise ValueError(f"Column '{column_name}' does not exist")
+        
+        cdef object column_id = self._column_ids[column_name]
+        if value is None:
+            self._insert_null(column_id)
+        else:
+            fn(column_id, self._coerce_fn[column_name](value))
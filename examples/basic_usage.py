@@ -13,11 +13,13 @@ def example_basic():
     db = ColumnDB()
     
     # Define schema
-    db.add_column("id", DataType.INT64)
-    db.add_column("name", DataType.STRING)
-    db.add_column("age", DataType.INT32)
-    db.add_column("salary", DataType.FLOAT64)
-    db.add_column("active", DataType.BOOL)
+    db.add_columns([
+        ("id", DataType.INT64),
+        ("name", DataType.STRING),
+        ("age", DataType.INT32),
+        ("salary", DataType.FLOAT64),
+        ("active", DataType.BOOL),
+    ])
     
     print(f"Database schema: {db.get_schema()}\n")
     
@@ -30,15 +32,12 @@ def example_basic():
         (5, "Eve Wilson", None, 70000.0, True),  # NULL age
     ]
     
-    for emp_id, name, age, salary, active in employees:
-        db.insert("id", emp_id)
-        db.insert("name", name)
-        if age is not None:
-            db.insert("age", age)
-        else:
-            db.insert("age", None)
-        db.insert("salary", salary)
-        db.insert("active", active)
+    # Insert column-at-a-time: one C call per column instead of one per value
+    db.insert_many("id", [r[0] for r in employees])
+    db.insert_many("name", [r[1] for r in employees])
+    db.insert_many("age", [r[2] for r in employees])
+    db.insert_many("salary", [r[3] for r in employees])
+    db.insert_many("active", [r[4] for r in employees])
     
     print(f"Inserted {db.get_num_rows()} rows\n")
     
@@ -64,21 +63,23 @@ def example_types():
     
     db = ColumnDB()
     
-    db.add_column("int32_col", DataType.INT32)
-    db.add_column("int64_col", DataType.INT64)
-    db.add_column("float32_col", DataType.FLOAT32)
-    db.add_column("float64_col", DataType.FLOAT64)
-    db.add_column("string_col", DataType.STRING)
-    db.add_column("bool_col", DataType.BOOL)
+    db.add_columns([
+        ("int32_col", DataType.INT32),
+        ("int64_col", DataType.INT64),
+        ("float32_col", DataType.FLOAT32),
+        ("float64_col", DataType.FLOAT64),
+        ("string_col", DataType.STRING),
+        ("bool_col", DataType.BOOL),
+    ])
     
-    # Insert data
-    for i in range(3):
-        db.insert("int32_col", i * 100)
-        db.insert("int64_col", i * 1000000)
-        db.insert("float32_col", 3.14 * i)
-        db.insert("float64_col", 2.718 * i)
-        db.insert("string_col", f"value_{i}")
-        db.insert("bool_col", i % 2 == 0)
+    # Insert data column-at-a-time
+    rows = range(3)
+    db.insert_many("int32_col", [i * 100 for i in rows])
+    db.insert_many("int64_col", [i * 1000000 for i in rows])
+    db.insert_many("float32_col", [3.14 * i for i in rows])
+    db.insert_many("float64_col", [2.718 * i for i in rows])
+    db.insert_many("string_col", [f"value_{i}" for i in rows])
+    db.insert_many("bool_col", [i % 2 == 0 for i in rows])
     
     print("Column Data:")
     for col_name in ["int32_col", "int64_col", "float32_col", "float64_col", "string_col", "bool_col"]:
@@ -103,10 +104,12 @@ def example_with_pandas():
             ("Monitor", 10, 299.99),
         ]
         
-        for product, qty, price in products:
-            db.insert("product", product)
-            db.insert("quantity", qty)
-            db.insert("price", price)
+        import numpy as np
+        
+        db.insert_many("product", [p[0] for p in products])
+        # Numeric columns can be loaded straight from NumPy arrays
+        db.insert_array("quantity", np.array([p[1] for p in products], dtype=np.int32))
+        db.insert_array("price", np.array([p[2] for p in products], dtype=np.float64))
         
         df = db.to_pandas()
         print(df)
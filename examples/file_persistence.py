@@ -32,11 +32,14 @@ def main():
         (4, "David Brown", 55000.0, False),
     ]
     
-    for emp_id, name, salary, is_manager in data:
-        db.insert("employee_id", emp_id)
-        db.insert("name", name)
-        db.insert("salary", salary)
-        db.insert("is_manager", is_manager)
+    # The row count is known, so size every column once up front
+    db.reserve(len(data))
+    
+    # Load one column at a time, matching the columnar storage layout
+    db.insert_many("employee_id", [row[0] for row in data])
+    db.insert_many("name", [row[1] for row in data])
+    db.insert_many("salary", [row[2] for row in data])
+    db.insert_many("is_manager", [row[3] for row in data])
     
     # Display the data
     print("\nOriginal database:")
@@ -15,10 +15,29 @@ typedef enum {
     CDB_TYPE_FLOAT32 = 2,
     CDB_TYPE_FLOAT64 = 3,
     CDB_TYPE_STRING = 4,
-    CDB_TYPE_BOOL = 5
+    CDB_TYPE_BOOL = 5,
+    CDB_TYPE_STRING_DICT = 6   /* Dictionary-encoded string */
 } cdb_data_type_t;
 
-/* Column structure */
+/* Dictionary of unique strings for a STRING_DICT column */
+typedef struct cdb_string_dict {
+    char** values;        /* Unique strings, indexed by code */
+    uint32_t size;        /* Number of unique strings */
+    uint32_t capacity;    /* Allocated length of values */
+    uint32_t* slots;      /* Open-addressing hash table of code + 1 (0 = empty) */
+    size_t num_slots;     /* Hash table size (power of two) */
+} cdb_string_dict_t;
+
+/*
+ * Column structure
+ *
+ * Storage is struct-of-arrays: each column owns one flat, typed buffer
+ * (int32_t*, int64_t*, float*, double* or char**) plus a separate null
+ * bitmap. BOOL columns are bit-packed into uint64_t words, one bit per row. STRING_DICT columns store a uint32_t code per row that
+ * indexes into the column's dictionary of unique strings. NULL rows set a bit and leave a zeroed slot in the buffer, so
+ * scans over a column touch a single contiguous array. Values are only
+ * converted to Python objects at the extension boundary.
+ */
 typedef struct cdb_column {
     char* name;
     cdb_data_type_t data_type;
@@ -26,6 +45,9 @@ typedef struct cdb_column {
     size_t capacity;      /* Allocated capacity */
     size_t num_rows;      /* Number of rows in this column */
     uint8_t* null_bitmap; /* Null bitmap for handling NULL values */
+    cdb_string_dict_t* dict; /* Dictionary for STRING_DICT columns (NULL otherwise) */
+    int owns_data;        /* 0 while data points into a mapped file (read-only) */
+    int has_any_null;     /* 0 until a NULL is stored; scans skip the bitmap while 0 */
 } cdb_column_t;
 
 /* Database structure */
@@ -34,6 +56,8 @@ typedef struct cdb_database {
     cdb_column_t* columns;
     size_t num_columns;
     size_t capacity;      /* Column capacity */
+    void* mapping;        /* Loaded .cdb file that columns may point into */
+    size_t mapping_size;
 } cdb_database_t;
 
 /* Memory management */
@@ -45,11 +69,27 @@ int cdb_open(const char* filename, cdb_database_t* db);
 int cdb_save(const char* filename, cdb_database_t* db);
 int cdb_save_to(cdb_database_t* db, const char* filename);  /* Save to specific file */
 int cdb_load_from(cdb_database_t* db, const char* filename); /* Load from specific file */
+void cdb_release_mapping(cdb_database_t* db);
 
 /* Schema management */
 int cdb_add_column(cdb_database_t* db, const char* name, cdb_data_type_t type);
+int cdb_add_columns(cdb_database_t* db, const char** names, const cdb_data_type_t* types, size_t count);
 int cdb_get_column_index(cdb_database_t* db, const char* name);
 cdb_column_t* cdb_get_column(cdb_database_t* db, const char* name);
+cdb_column_t* cdb_get_column_by_id(cdb_database_t* db, int column_id);
+
+/* Column storage */
+size_t cdb_type_size(cdb_data_type_t type);
+size_t cdb_column_storage_size(cdb_data_type_t type, size_t num_rows);
+int cdb_column_ensure_capacity(cdb_column_t* col, size_t min_rows);
+int cdb_column_reserve(cdb_column_t* col, size_t num_rows);
+int cdb_reserve(cdb_database_t* db, size_t num_rows);
+int cdb_column_attach(cdb_column_t* col, void* data, size_t num_rows);
+void cdb_column_set_null(cdb_column_t* col, size_t row_index);
+void cdb_bool_set(cdb_column_t* col, size_t row_index, int value);
+void cdb_bool_pack(cdb_column_t* col, size_t start, const uint8_t* values, size_t count);
+void cdb_bool_unpack(const cdb_column_t* col, uint8_t* out);
+int cdb_string_dict_encode(cdb_column_t* col, const char* value, uint32_t* code);
 
 /* Data insertion */
 int cdb_insert_int32(cdb_database_t* db, const char* column_name, int32_t value);
@@ -60,6 +100,15 @@ int cdb_insert_string(cdb_database_t* db, const char* column_name, const char* v
 int cdb_insert_bool(cdb_database_t* db, const char* column_name, uint8_t value);
 int cdb_insert_null(cdb_database_t* db, const char* column_name);
 
+/* Data insertion by column id; skips the name lookup for hot loops */
+int cdb_insert_int32_by_id(cdb_database_t* db, int column_id, int32_t value);
+int cdb_insert_int64_by_id(cdb_database_t* db, int column_id, int64_t value);
+int cdb_insert_float32_by_id(cdb_database_t* db, int column_id, float value);
+int cdb_insert_float64_by_id(cdb_database_t* db, int column_id, double value);
+int cdb_insert_string_by_id(cdb_database_t* db, int column_id, const char* value);
+int cdb_insert_bool_by_id(cdb_database_t* db, int column_id, uint8_t value);
+int cdb_insert_null_by_id(cdb_database_t* db, int column_id);
+
 /* Data retrieval */
 int32_t cdb_get_int32(cdb_column_t* col, size_t row_index);
 int64_t cdb_get_int64(cdb_column_t* col, size_t row_index);
@@ -68,6 +117,10 @@ double cdb_get_float64(cdb_column_t* col, size_t row_index);
 char* cdb_get_string(cdb_column_t* col, size_t row_index);
 uint8_t cdb_get_bool(cdb_column_t* col, size_t row_index);
 int cdb_is_null(cdb_column_t* col, size_t row_index);
+uint64_t cdb_null_word(const cdb_column_t* col, size_t word_index);
+size_t cdb_null_count(const cdb_column_t* col);
+void cdb_column_refresh_null_flag(cdb_column_t* col);
+size_t cdb_count_true(const cdb_column_t* col);
 
 /* Statistics and metadata */
 size_t cdb_get_num_rows(cdb_database_t* db);
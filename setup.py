@@ -81,9 +81,28 @@ columndb_extension = Extension(
     extra_compile_args=[
         '-std=c99',
         '-Wall',
+        '-pthread',
     ] if sys.platform != 'win32' else ['/D_CRT_SECURE_NO_WARNINGS'],
+    # save() writes columns from several threads
+    extra_link_args=['-pthread'] if sys.platform != 'win32' else [],
 )
 
+ext_modules = [columndb_extension]
+
+# Optionally compile the Cython insert dispatcher; the package falls back to
+# pure Python when it is absent. Set COLUMNDB_USE_CYTHON=0 to skip it.
+if os.environ.get('COLUMNDB_USE_CYTHON', '1') != '0':
+    try:
+        from Cython.Build import cythonize
+    except ImportError:
+        cythonize = None
+    
+    if cythonize is not None:
+        ext_modules += cythonize(
+            [Extension('columndb._wrapper', sources=['columndb/_wrapper.pyx'])],
+            compiler_directives={'language_level': '3'},
+        )
+
 setup(
     name='columndb',
     version='0.1.0',
@@ -94,7 +113,7 @@ setup(
     author_email='praba230890@gmail.com',
     url='https://github.com/praba230890/pyColumnDB',
     packages=find_packages(),
-    ext_modules=[columndb_extension],
+    ext_modules=ext_modules,
     python_requires='>=3.7',
     classifiers=[
         'Development Status :: 3 - Alpha',
@@ -1,74 +1,206 @@
 #!/usr/bin/env python3
 """
 ColumnDB Setup Script - Quick setup for UV or traditional pip
+
+The pip path installs through ``uv pip`` when uv is available, since uv
+downloads and installs wheels in parallel. Set COLUMNDB_USE_UV=0 to use
+plain pip, or PIP_INSTALL_CMD to choose the installer command outright
+(e.g. PIP_INSTALL_CMD="python -m pip").
 """
 
+import argparse
+import functools
+import os
+import shutil
 import subprocess
 import sys
-import platform
 
-def run_command(cmd, description):
-    """Run a command and report status"""
+# concurrent.futures, pathlib, shlex and sysconfig are imported inside the
+# helpers that need them, so --help and the menu don't pay for them
+
+# Resolved once (finds uv.exe on Windows); None when uv is not on the PATH
+UV = shutil.which("uv")
+
+# The project directory; commands run there and paths are relative to it,
+# so the wizard works from any current directory
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Dev dependencies pinned by `uv pip compile`, reused until pyproject.toml or
+# this script changes; relative to ROOT
+LOCK_FILE = "requirements-dev.lock"
+
+def run_command(argv, description, env=None):
+    """Run a command given as an argv list (no shell) and report status"""
     print(f"\n{'='*60}")
     print(f"📌 {description}")
     print(f"{'='*60}")
-    print(f"Running: {cmd}\n")
+    print(f"Running: {' '.join(argv)}\n")
     
-    result = subprocess.run(cmd, shell=True)
+    # Output is kept back and only shown when the step fails; this also
+    # keeps steps run by run_parallel from interleaving their logs
+    try:
+        result = subprocess.run(argv, env=env, cwd=ROOT, capture_output=True, text=True,
+                                errors="replace")
+    except OSError as e:
+        print(f"\n❌ Failed: {description} ({e})")
+        return False
     if result.returncode != 0:
+        print(result.stdout, end="")
+        print(result.stderr, end="", file=sys.stderr)
         print(f"\n❌ Failed: {description}")
         return False
     else:
         print(f"\n✅ Success: {description}")
         return True
 
+def run_parallel(steps):
+    """Run independent (argv, description) steps concurrently; True if all succeed"""
+    from concurrent.futures import ThreadPoolExecutor
+    
+    with ThreadPoolExecutor(max_workers=len(steps)) as pool:
+        futures = [pool.submit(run_command, *step) for step in steps]
+        results = [future.result() for future in futures]
+    return all(results)
+
+@functools.lru_cache(maxsize=1)
 def check_uv_installed():
-    """Check if UV is installed"""
-    result = subprocess.run(
-        "uv --version" if sys.platform != "win32" else "uv.exe --version",
-        shell=True,
-        capture_output=True
-    )
+    """Check if UV is installed (runs `uv --version` at most once per process)"""
+    if UV is None:
+        return False
+    try:
+        result = subprocess.run([UV, "--version"], capture_output=True)
+    except OSError:
+        return False
     return result.returncode == 0
 
-def setup_with_uv():
+def _needs_rebuild(force=False):
+    """True unless the built extension is newer than every C and Cython source"""
+    if force:
+        return True
+    
+    import importlib.util
+    import sysconfig
+    from pathlib import Path
+    
+    root = Path(ROOT)
+    suffix = sysconfig.get_config_var('EXT_SUFFIX')
+    artifacts = [root / "columndb" / f"columndb{suffix}"]
+    # setup.py also builds the Cython dispatcher when Cython is importable
+    if (os.environ.get("COLUMNDB_USE_CYTHON", "1") != "0"
+            and importlib.util.find_spec("Cython") is not None):
+        artifacts.append(root / "columndb" / f"_wrapper{suffix}")
+    if not all(artifact.exists() for artifact in artifacts):
+        return True
+    
+    sources = [*root.glob("src/*.c"), *root.glob("include/*.h"),
+               root / "columndb" / "_wrapper.pyx", root / "setup.py"]
+    built = min(artifact.stat().st_mtime for artifact in artifacts)
+    if any(source.stat().st_mtime > built for source in sources if source.exists()):
+        return True
+    
+    print("\n⏭️  C extension up to date (use --force to rebuild)")
+    return False
+
+def _lock_is_fresh():
+    """True if the dev lock file is newer than pyproject.toml and this script"""
+    try:
+        locked = os.path.getmtime(os.path.join(ROOT, LOCK_FILE))
+        return all(locked >= os.path.getmtime(path)
+                   for path in (os.path.join(ROOT, "pyproject.toml"), os.path.abspath(__file__)))
+    except OSError:
+        return False
+
+def _build_step():
+    """
+    The build_ext step as (argv, description, env).
+    
+    Sources compile in parallel, and through ccache when it is installed so
+    rebuilds of unchanged sources are served from its cache.
+    """
+    cmd = [sys.executable, "setup.py", "build_ext", "--inplace", "-j", str(os.cpu_count() or 1)]
+    if sys.platform == "win32":
+        return cmd, "Building C extension", None
+    
+    if not shutil.which("ccache"):
+        print("\n⚠️  ccache not found; the C extension will be compiled from scratch.")
+        print("Install it for faster rebuilds: https://ccache.dev/download.html")
+        return cmd, "Building C extension", None
+    
+    import sysconfig
+    
+    env = os.environ.copy()
+    cc = env.get("CC") or sysconfig.get_config_var("CC") or "cc"
+    if "ccache" not in cc:
+        env["CC"] = f"ccache {cc}"
+    return cmd, "Building C extension (ccache)", env
+
+def _installer_cmd():
+    """Installer argv prefix for the pip path (uv pip when available, else pip)"""
+    override = os.environ.get("PIP_INSTALL_CMD")
+    if override:
+        import shlex
+        return shlex.split(override)
+    if os.environ.get("COLUMNDB_USE_UV", "1") != "0" and check_uv_installed():
+        return [UV, "pip"]
+    return ["pip"]
+
+def setup_with_uv(force=False):
     """Setup using UV"""
     print("\n🚀 Setting up ColumnDB with UV...")
     
-    steps = [
-        ("python setup.py build_ext --inplace", "Building C extension"),
-        ("uv pip install -e .", "Installing ColumnDB package"),
-        ("uv pip install -e \".[dev,pandas]\"", "Installing dev dependencies"),
-    ]
+    # Resolve the dependencies into the lock file (only when pyproject.toml
+    # changed) while the extension compiles; the installs wait, since the
+    # editable install also writes the built extension into columndb/
+    prepare = []
+    if _lock_is_fresh():
+        print(f"\n⏭️  {LOCK_FILE} up to date (dependency resolution skipped)")
+    else:
+        prepare.append(([UV, "pip", "compile", "pyproject.toml", "--extra", "dev",
+                         "--extra", "pandas", "--extra", "arrow", "-o", LOCK_FILE],
+                        f"Resolving dependencies into {LOCK_FILE}"))
+    if _needs_rebuild(force):
+        prepare.insert(0, _build_step())
+    if prepare and not run_parallel(prepare):
+        return False
     
-    for cmd, desc in steps:
-        if not run_command(cmd, desc):
-            return False
+    # sync installs exactly the locked set without resolving, removing any
+    # other package; ColumnDB itself is not in the lock, so it is installed
+    # on top without dependencies
+    if not run_command([UV, "pip", "sync", LOCK_FILE], "Installing locked dev dependencies"):
+        return False
+    if not run_command([UV, "pip", "install", "-e", ".", "--no-deps"], "Installing ColumnDB"):
+        return False
     
     print("\n" + "="*60)
     print("🎉 Setup complete with UV!")
     print("="*60)
     print("\nNext steps:")
     print("  1. Run example:     uv run python examples/basic_usage.py")
-    print("  2. Run tests:       uv run pytest tests/ -v")
+    print("  2. Run tests:       uv run pytest tests/ -v -n auto")
     print("  3. Format code:     uv run black columndb/ tests/ examples/")
     print("  4. Lint code:       uv run flake8 columndb/ tests/ examples/")
     print("\nFor more info: see UV_GUIDE.md")
     
     return True
 
-def setup_with_pip():
+def setup_with_pip(force=False):
     """Setup using traditional pip"""
     print("\n🚀 Setting up ColumnDB with pip...")
     
+    install = _installer_cmd() + ["install"]
+    if install[0] == UV:
+        # Install into the interpreter running the wizard, as pip would,
+        # rather than requiring an activated virtual environment
+        install += ["--python", sys.executable]
+    
     steps = [
-        ("python setup.py build_ext --inplace", "Building C extension"),
-        ("pip install -e .", "Installing ColumnDB package"),
-        ("pip install -e \".[dev,pandas]\"", "Installing dev dependencies"),
+        (install + ["-e", ".[dev,pandas]"], "Installing ColumnDB with dev dependencies"),
     ]
+    if _needs_rebuild(force):
+        steps.insert(0, _build_step())
     
-    for cmd, desc in steps:
-        if not run_command(cmd, desc):
+    for step in steps:
+        if not run_command(*step):
             return False
     
     print("\n" + "="*60)
@@ -76,7 +208,7 @@ def setup_with_pip():
     print("="*60)
     print("\nNext steps:")
     print("  1. Run example:     python examples/basic_usage.py")
-    print("  2. Run tests:       python -m pytest tests/ -v")
+    print("  2. Run tests:       python -m pytest tests/ -v -n auto")
     print("  3. Format code:     black columndb/ tests/ examples/")
     print("  4. Lint code:       flake8 columndb/ tests/ examples/")
     
@@ -84,6 +216,11 @@ def setup_with_pip():
 
 def main():
     """Main setup routine"""
+    parser = argparse.ArgumentParser(description="Set up ColumnDB for development")
+    parser.add_argument("--force", action="store_true",
+                        help="rebuild the C extension even if it is up to date")
+    args = parser.parse_args()
+    
     print("\n" + "="*60)
     print("  ColumnDB - Setup Wizard")
     print("="*60)
@@ -101,10 +238,10 @@ def main():
             print("Install UV with: pip install uv")
             print("Or visit: https://docs.astral.sh/uv/getting-started/")
             return False
-        return setup_with_uv()
+        return setup_with_uv(force=args.force)
     
     elif choice == "2":
-        return setup_with_pip()
+        return setup_with_pip(force=args.force)
     
     elif choice == "3":
         print("\n⏭️  Skipped setup.")
@@ -5,6 +5,7 @@
 
 #define INITIAL_CAPACITY 10
 #define INITIAL_COLUMNS 5
+#define INITIAL_DICT_SLOTS 16
 #define STRING_MAX_LEN 1024
 
 /* Error message storage (simple thread-safe alternative) */
@@ -37,58 +38,30 @@ cdb_database_t* cdb_create_database(void) {
     db->num_columns = 0;
     db->capacity = INITIAL_COLUMNS;
     db->filename = NULL;
+    db->mapping = NULL;
+    db->mapping_size = 0;
     
     return db;
 }
 
+static void free_column(cdb_column_t* col);
+
 /* Free a database */
 void cdb_free_database(cdb_database_t* db) {
     if (!db) return;
     
     for (size_t i = 0; i < db->num_columns; i++) {
-        free(db->columns[i].name);
-        if (db->columns[i].data_type == CDB_TYPE_STRING) {
-            for (size_t j = 0; j < db->columns[i].num_rows; j++) {
-                char** strings = (char**)db->columns[i].data;
-                if (strings[j]) free(strings[j]);
-            }
-        }
-        free(db->columns[i].data);
-        free(db->columns[i].null_bitmap);
+        free_column(&db->columns[i]);
     }
     
     free(db->columns);
     if (db->filename) free(db->filename);
+    cdb_release_mapping(db);
     free(db);
 }
 
-/* Add a column to the database */
-int cdb_add_column(cdb_database_t* db, const char* name, cdb_data_type_t type) {
-    if (!db || !name) {
-        set_error("Invalid database or column name");
-        return -1;
-    }
-    
-    /* Check if column name already exists */
-    for (size_t i = 0; i < db->num_columns; i++) {
-        if (strcmp(db->columns[i].name, name) == 0) {
-            set_error("Column already exists");
-            return -1;
-        }
-    }
-    
-    /* Resize columns array if needed */
-    if (db->num_columns >= db->capacity) {
-        db->capacity *= 2;
-        cdb_column_t* new_columns = (cdb_column_t*)realloc(db->columns, db->capacity * sizeof(cdb_column_t));
-        if (!new_columns) {
-            set_error("Failed to expand columns array");
-            return -1;
-        }
-        db->columns = new_columns;
-    }
-    
-    cdb_column_t* col = &db->columns[db->num_columns];
+/* Initialize a column descriptor in place */
+static int init_column(cdb_column_t* col, const char* name, cdb_data_type_t type) {
     col->name = (char*)malloc(strlen(name) + 1);
     if (!col->name) {
         set_error("Failed to allocate column name");
@@ -99,34 +72,18 @@ int cdb_add_column(cdb_database_t* db, const char* name, cdb_data_type_t type) {
     col->data_type = type;
     col->capacity = INITIAL_CAPACITY;
     col->num_rows = 0;
+    col->owns_data = 1;
+    col->has_any_null = 0;
     
     /* Allocate data array based on type */
-    size_t element_size = 0;
-    switch (type) {
-        case CDB_TYPE_INT32:
-            element_size = sizeof(int32_t);
-            break;
-        case CDB_TYPE_INT64:
-            element_size = sizeof(int64_t);
-            break;
-        case CDB_TYPE_FLOAT32:
-            element_size = sizeof(float);
-            break;
-        case CDB_TYPE_FLOAT64:
-            element_size = sizeof(double);
-            break;
-        case CDB_TYPE_STRING:
-            element_size = sizeof(char*);
-            break;
-        case CDB_TYPE_BOOL:
-            element_size = sizeof(uint8_t);
-            break;
-        default:
-            set_error("Unknown data type");
-            return -1;
+    size_t element_size = cdb_type_size(type);
+    if (element_size == 0) {
+        set_error("Unknown data type");
+        free(col->name);
+        return -1;
     }
     
-    col->data = (void*)malloc(col->capacity * element_size);
+    col->data = (void*)malloc(cdb_column_storage_size(type, col->capacity));
     if (!col->data) {
         set_error("Failed to allocate column data");
         free(col->name);
@@ -142,7 +99,121 @@ int cdb_add_column(cdb_database_t* db, const char* name, cdb_data_type_t type) {
         return -1;
     }
     
-    db->num_columns++;
+    col->dict = NULL;
+    if (type == CDB_TYPE_STRING_DICT) {
+        col->dict = (cdb_string_dict_t*)calloc(1, sizeof(cdb_string_dict_t));
+        if (col->dict) {
+            col->dict->num_slots = INITIAL_DICT_SLOTS;
+            col->dict->slots = (uint32_t*)calloc(INITIAL_DICT_SLOTS, sizeof(uint32_t));
+        }
+        if (!col->dict || !col->dict->slots) {
+            set_error("Failed to allocate string dictionary");
+            free(col->dict);
+            free(col->null_bitmap);
+            free(col->data);
+            free(col->name);
+            return -1;
+        }
+    }
+    
+    return 0;
+}
+
+/* Release everything a column descriptor owns */
+static void free_column(cdb_column_t* col) {
+    free(col->name);
+    if (col->data_type == CDB_TYPE_STRING) {
+        char** strings = (char**)col->data;
+        for (size_t j = 0; j < col->num_rows; j++) {
+            if (strings[j]) free(strings[j]);
+        }
+    }
+    if (col->dict) {
+        for (uint32_t j = 0; j < col->dict->size; j++) {
+            free(col->dict->values[j]);
+        }
+        free(col->dict->values);
+        free(col->dict->slots);
+        free(col->dict);
+    }
+    if (col->owns_data) free(col->data);
+    free(col->null_bitmap);
+}
+
+/* Make room for at least min_columns column descriptors */
+static int ensure_column_capacity(cdb_database_t* db, size_t min_columns) {
+    if (min_columns <= db->capacity) {
+        return 0;
+    }
+    
+    size_t new_capacity = db->capacity ? db->capacity : INITIAL_COLUMNS;
+    while (new_capacity < min_columns) {
+        new_capacity *= 2;
+    }
+    
+    cdb_column_t* new_columns = (cdb_column_t*)realloc(db->columns, new_capacity * sizeof(cdb_column_t));
+    if (!new_columns) {
+        set_error("Failed to expand columns array");
+        return -1;
+    }
+    db->columns = new_columns;
+    db->capacity = new_capacity;
+    return 0;
+}
+
+/* Add a column to the database */
+int cdb_add_column(cdb_database_t* db, const char* name, cdb_data_type_t type) {
+    return cdb_add_columns(db, &name, &type, 1);
+}
+
+/* Add several columns at once, growing the descriptor array a single time */
+int cdb_add_columns(cdb_database_t* db, const char** names, const cdb_data_type_t* types, size_t count) {
+    if (!db || (count > 0 && (!names || !types))) {
+        set_error("Invalid database or column name");
+        return -1;
+    }
+    
+    /* Validate the whole batch before touching the database */
+    for (size_t i = 0; i < count; i++) {
+        if (!names[i]) {
+            set_error("Invalid database or column name");
+            return -1;
+        }
+        if (cdb_type_size(types[i]) == 0) {
+            set_error("Unknown data type");
+            return -1;
+        }
+        
+        /* Check if column name already exists */
+        for (size_t j = 0; j < db->num_columns; j++) {
+            if (strcmp(db->columns[j].name, names[i]) == 0) {
+                set_error("Column already exists");
+                return -1;
+            }
+        }
+        for (size_t j = 0; j < i; j++) {
+            if (strcmp(names[j], names[i]) == 0) {
+                set_error("Column already exists");
+                return -1;
+            }
+        }
+    }
+    
+    if (ensure_column_capacity(db, db->num_columns + count) < 0) {
+        return -1;
+    }
+    
+    for (size_t i = 0; i < count; i++) {
+        if (init_column(&db->columns[db->num_columns + i], names[i], types[i]) < 0) {
+            /* Undo the columns initialized so far */
+            while (i-- > 0) {
+                free_column(&db->columns[db->num_columns + i]);
+            }
+            return -1;
+        }
+    }
+    
+    db->num_columns += count;
     return 0;
 }
 
@@ -170,42 +241,286 @@ cdb_column_t* cdb_get_column(cdb_database_t* db, const char* name) {
     return &db->columns[idx];
 }
 
+/* Get column by id (the index returned by cdb_get_column_index) */
+cdb_column_t* cdb_get_column_by_id(cdb_database_t* db, int column_id) {
+    if (!db || column_id < 0 || (size_t)column_id >= db->num_columns) {
+        set_error("Invalid column id");
+        return NULL;
+    }
+    return &db->columns[column_id];
+}
+
+/*
+ * Size in bytes of one value of the given type as exchanged with callers
+ * (0 if unknown). BOOL values are one byte here but one bit in storage;
+ * use cdb_column_storage_size() for allocation sizes.
+ */
+size_t cdb_type_size(cdb_data_type_t type) {
+    switch (type) {
+        case CDB_TYPE_INT32: return sizeof(int32_t);
+        case CDB_TYPE_INT64: return sizeof(int64_t);
+        case CDB_TYPE_FLOAT32: return sizeof(float);
+        case CDB_TYPE_FLOAT64: return sizeof(double);
+        case CDB_TYPE_STRING: return sizeof(char*);
+        case CDB_TYPE_BOOL: return sizeof(uint8_t);
+        case CDB_TYPE_STRING_DICT: return sizeof(uint32_t);
+        default: return 0;
+    }
+}
+
+/* Bytes of storage a column of the given type needs for num_rows rows */
+size_t cdb_column_storage_size(cdb_data_type_t type, size_t num_rows) {
+    if (type == CDB_TYPE_BOOL) {
+        return ((num_rows + 63) / 64) * sizeof(uint64_t);
+    }
+    return num_rows * cdb_type_size(type);
+}
+
+/* Reallocate a column's data and null bitmap to exactly new_capacity rows */
+static int resize_column(cdb_column_t* col, size_t new_capacity) {
+    if (cdb_type_size(col->data_type) == 0) {
+        set_error("Unknown data type");
+        return -1;
+    }
+    
+    size_t old_size = cdb_column_storage_size(col->data_type, col->num_rows);
+    size_t new_size = cdb_column_storage_size(col->data_type, new_capacity);
+    void* new_data;
+    if (col->owns_data) {
+        new_data = realloc(col->data, new_size ? new_size : 1);
+    } else {
+        /* Copy-on-write: move rows out of the read-only mapping before growing */
+        new_data = malloc(new_size ? new_size : 1);
+        if (new_data) memcpy(new_data, col->data, old_size);
+    }
+    if (!new_data) {
+        set_error("Failed to expand column data");
+        return -1;
+    }
+    col->data = new_data;
+    col->owns_data = 1;
+    
+    size_t old_bitmap_size = (col->capacity + 7) / 8;
+    size_t new_bitmap_size = (new_capacity + 7) / 8;
+    uint8_t* new_bitmap = realloc(col->null_bitmap, new_bitmap_size);
+    if (!new_bitmap) {
+        set_error("Failed to expand null bitmap");
+        return -1;
+    }
+    /* Rows past the old capacity start out non-NULL */
+    memset(new_bitmap + old_bitmap_size, 0, new_bitmap_size - old_bitmap_size);
+    col->null_bitmap = new_bitmap;
+    
+    col->capacity = new_capacity;
+    return 0;
+}
+
+/* Grow a column (doubling) until it can hold at least min_rows rows */
+int cdb_column_ensure_capacity(cdb_column_t* col, size_t min_rows) {
+    if (min_rows <= col->capacity) {
+        return 0;
+    }
+    
+    size_t new_capacity = col->capacity ? col->capacity : INITIAL_CAPACITY;
+    while (new_capacity < min_rows) {
+        new_capacity *= 2;
+    }
+    
+    return resize_column(col, new_capacity);
+}
+
+/* Pre-size a column to hold exactly num_rows rows without further growth */
+int cdb_column_reserve(cdb_column_t* col, size_t num_rows) {
+    if (num_rows <= col->capacity) {
+        return 0;
+    }
+    return resize_column(col, num_rows);
+}
+
+/* Pre-size every column in the database to hold num_rows rows */
+int cdb_reserve(cdb_database_t* db, size_t num_rows) {
+    if (!db) {
+        set_error("Invalid database");
+        return -1;
+    }
+    
+    for (size_t i = 0; i < db->num_columns; i++) {
+        if (cdb_column_reserve(&db->columns[i], num_rows) < 0) {
+            return -1;
+        }
+    }
+    return 0;
+}
+
+/*
+ * Point a column at num_rows rows of data it does not own, such as a
+ * region of a mapped file. The column's capacity becomes exactly num_rows,
+ * so the first append copies the rows to the heap before writing.
+ */
+int cdb_column_attach(cdb_column_t* col, void* data, size_t num_rows) {
+    size_t bitmap_size = (num_rows + 7) / 8;
+    uint8_t* new_bitmap = realloc(col->null_bitmap, bitmap_size ? bitmap_size : 1);
+    if (!new_bitmap) {
+        set_error("Failed to allocate null bitmap");
+        return -1;
+    }
+    memset(new_bitmap, 0, bitmap_size);
+    col->null_bitmap = new_bitmap;
+    
+    if (col->owns_data) free(col->data);
+    col->data = data;
+    col->owns_data = 0;
+    col->capacity = num_rows;
+    return 0;
+}
+
 /* Helper to expand column data if needed */
 static int expand_column_if_needed(cdb_column_t* col) {
-    if (col->num_rows >= col->capacity) {
-        col->capacity *= 2;
-        
-        size_t element_size = 0;
-        switch (col->data_type) {
-            case CDB_TYPE_INT32: element_size = sizeof(int32_t); break;
-            case CDB_TYPE_INT64: element_size = sizeof(int64_t); break;
-            case CDB_TYPE_FLOAT32: element_size = sizeof(float); break;
-            case CDB_TYPE_FLOAT64: element_size = sizeof(double); break;
-            case CDB_TYPE_STRING: element_size = sizeof(char*); break;
-            case CDB_TYPE_BOOL: element_size = sizeof(uint8_t); break;
-            default: return -1;
+    return cdb_column_ensure_capacity(col, col->num_rows + 1);
+}
+
+/* Mark a row (within capacity) as NULL and zero its value slot */
+void cdb_column_set_null(cdb_column_t* col, size_t row_index) {
+    if (col->data_type == CDB_TYPE_BOOL) {
+        cdb_bool_set(col, row_index, 0);
+    } else {
+        size_t element_size = cdb_type_size(col->data_type);
+        memset((char*)col->data + row_index * element_size, 0, element_size);
+    }
+    col->null_bitmap[row_index / 8] |= (uint8_t)(1 << (row_index % 8));
+    col->has_any_null = 1;
+}
+
+/* Store a row (within capacity) of a bit-packed BOOL column */
+void cdb_bool_set(cdb_column_t* col, size_t row_index, int value) {
+    uint64_t* words = (uint64_t*)col->data;
+    uint64_t bit = 1ULL << (row_index & 63);
+    if (value) {
+        words[row_index >> 6] |= bit;
+    } else {
+        words[row_index >> 6] &= ~bit;
+    }
+}
+
+/* Pack count one-byte bools into a BOOL column starting at row start (within capacity) */
+void cdb_bool_pack(cdb_column_t* col, size_t start, const uint8_t* values, size_t count) {
+    uint64_t* words = (uint64_t*)col->data;
+    size_t i = 0;
+    
+    /* Bit by bit up to a word boundary, then whole words at a time */
+    for (; i < count && ((start + i) & 63); i++) {
+        cdb_bool_set(col, start + i, values[i]);
+    }
+    for (; i + 64 <= count; i += 64) {
+        uint64_t word = 0;
+        for (unsigned b = 0; b < 64; b++) {
+            word |= (uint64_t)(values[i + b] != 0) << b;
         }
-        
-        void* new_data = realloc(col->data, col->capacity * element_size);
-        if (!new_data) {
-            set_error("Failed to expand column data");
-            return -1;
+        words[(start + i) >> 6] = word;
+    }
+    for (; i < count; i++) {
+        cdb_bool_set(col, start + i, values[i]);
+    }
+}
+
+/* Unpack every row of a BOOL column into one byte (0 or 1) per row */
+void cdb_bool_unpack(const cdb_column_t* col, uint8_t* out) {
+    const uint64_t* words = (const uint64_t*)col->data;
+    for (size_t i = 0; i < col->num_rows; i++) {
+        out[i] = (uint8_t)((words[i >> 6] >> (i & 63)) & 1);
+    }
+}
+
+/* FNV-1a hash of a NUL-terminated string */
+static uint32_t hash_string(const char* value) {
+    uint32_t hash = 2166136261u;
+    for (const unsigned char* p = (const unsigned char*)value; *p; p++) {
+        hash ^= *p;
+        hash *= 16777619u;
+    }
+    return hash;
+}
+
+/* Double the dictionary hash table and re-insert every code */
+static int grow_dict_slots(cdb_string_dict_t* dict) {
+    size_t num_slots = dict->num_slots * 2;
+    uint32_t* slots = (uint32_t*)calloc(num_slots, sizeof(uint32_t));
+    if (!slots) {
+        set_error("Failed to expand string dictionary");
+        return -1;
+    }
+    
+    for (uint32_t code = 0; code < dict->size; code++) {
+        size_t i = hash_string(dict->values[code]) & (num_slots - 1);
+        while (slots[i]) {
+            i = (i + 1) & (num_slots - 1);
         }
-        col->data = new_data;
-        
-        uint8_t* new_bitmap = realloc(col->null_bitmap, (col->capacity + 7) / 8);
-        if (!new_bitmap) {
-            set_error("Failed to expand null bitmap");
+        slots[i] = code + 1;
+    }
+    
+    free(dict->slots);
+    dict->slots = slots;
+    dict->num_slots = num_slots;
+    return 0;
+}
+
+/* Look up (or add) a string in a STRING_DICT column's dictionary */
+int cdb_string_dict_encode(cdb_column_t* col, const char* value, uint32_t* code) {
+    cdb_string_dict_t* dict = col->dict;
+    if (!dict || !value) {
+        set_error("Column is not dictionary-encoded");
+        return -1;
+    }
+    
+    size_t mask = dict->num_slots - 1;
+    size_t i = hash_string(value) & mask;
+    while (dict->slots[i]) {
+        uint32_t existing = dict->slots[i] - 1;
+        if (strcmp(dict->values[existing], value) == 0) {
+            *code = existing;
+            return 0;
+        }
+        i = (i + 1) & mask;
+    }
+    
+    if (dict->size == UINT32_MAX - 1) {
+        set_error("String dictionary is full");
+        return -1;
+    }
+    
+    if (dict->size >= dict->capacity) {
+        uint32_t new_capacity = dict->capacity ? dict->capacity * 2 : INITIAL_DICT_SLOTS;
+        char** values = (char**)realloc(dict->values, new_capacity * sizeof(char*));
+        if (!values) {
+            set_error("Failed to expand string dictionary");
             return -1;
         }
-        col->null_bitmap = new_bitmap;
+        dict->values = values;
+        dict->capacity = new_capacity;
+    }
+    
+    size_t len = strlen(value) + 1;
+    char* copy = (char*)malloc(len);
+    if (!copy) {
+        set_error("Failed to allocate string memory");
+        return -1;
+    }
+    memcpy(copy, value, len);
+    
+    *code = dict->size;
+    dict->values[dict->size++] = copy;
+    dict->slots[i] = *code + 1;
+    
+    /* Keep the table at most half full so probe chains stay short */
+    if ((size_t)dict->size * 2 > dict->num_slots) {
+        return grow_dict_slots(dict);
     }
     return 0;
 }
 
-/* Insert int32 */
-int cdb_insert_int32(cdb_database_t* db, const char* column_name, int32_t value) {
-    cdb_column_t* col = cdb_get_column(db, column_name);
+/* Insert int32 by column id */
+int cdb_insert_int32_by_id(cdb_database_t* db, int column_id, int32_t value) {
+    cdb_column_t* col = cdb_get_column_by_id(db, column_id);
     if (!col || col->data_type != CDB_TYPE_INT32) {
         set_error("Column not found or type mismatch");
         return -1;
@@ -220,9 +535,14 @@ int cdb_insert_int32(cdb_database_t* db, const char* column_name, int32_t value)
     return 0;
 }
 
-/* Insert int64 */
-int cdb_insert_int64(cdb_database_t* db, const char* column_name, int64_t value) {
-    cdb_column_t* col = cdb_get_column(db, column_name);
+/* Insert int32 by column name */
+int cdb_insert_int32(cdb_database_t* db, const char* column_name, int32_t value) {
+    return cdb_insert_int32_by_id(db, cdb_get_column_index(db, column_name), value);
+}
+
+/* Insert int64 by column id */
+int cdb_insert_int64_by_id(cdb_database_t* db, int column_id, int64_t value) {
+    cdb_column_t* col = cdb_get_column_by_id(db, column_id);
     if (!col || col->data_type != CDB_TYPE_INT64) {
         set_error("Column not found or type mismatch");
         return -1;
@@ -237,9 +557,14 @@ int cdb_insert_int64(cdb_database_t* db, const char* column_name, int64_t value)
     return 0;
 }
 
-/* Insert float32 */
-int cdb_insert_float32(cdb_database_t* db, const char* column_name, float value) {
-    cdb_column_t* col = cdb_get_column(db, column_name);
+/* Insert int64 by column name */
+int cdb_insert_int64(cdb_database_t* db, const char* column_name, int64_t value) {
+    return cdb_insert_int64_by_id(db, cdb_get_column_index(db, column_name), value);
+}
+
+/* Insert float32 by column id */
+int cdb_insert_float32_by_id(cdb_database_t* db, int column_id, float value) {
+    cdb_column_t* col = cdb_get_column_by_id(db, column_id);
     if (!col || col->data_type != CDB_TYPE_FLOAT32) {
         set_error("Column not found or type mismatch");
         return -1;
@@ -254,9 +579,14 @@ int cdb_insert_float32(cdb_database_t* db, const char* column_name, float value)
     return 0;
 }
 
-/* Insert float64 */
-int cdb_insert_float64(cdb_database_t* db, const char* column_name, double value) {
-    cdb_column_t* col = cdb_get_column(db, column_name);
+/* Insert float32 by column name */
+int cdb_insert_float32(cdb_database_t* db, const char* column_name, float value) {
+    return cdb_insert_float32_by_id(db, cdb_get_column_index(db, column_name), value);
+}
+
+/* Insert float64 by column id */
+int cdb_insert_float64_by_id(cdb_database_t* db, int column_id, double value) {
+    cdb_column_t* col = cdb_get_column_by_id(db, column_id);
     if (!col || col->data_type != CDB_TYPE_FLOAT64) {
         set_error("Column not found or type mismatch");
         return -1;
@@ -271,16 +601,29 @@ int cdb_insert_float64(cdb_database_t* db, const char* column_name, double value
     return 0;
 }
 
-/* Insert string */
-int cdb_insert_string(cdb_database_t* db, const char* column_name, const char* value) {
-    cdb_column_t* col = cdb_get_column(db, column_name);
-    if (!col || col->data_type != CDB_TYPE_STRING) {
+/* Insert float64 by column name */
+int cdb_insert_float64(cdb_database_t* db, const char* column_name, double value) {
+    return cdb_insert_float64_by_id(db, cdb_get_column_index(db, column_name), value);
+}
+
+/* Insert string by column id */
+int cdb_insert_string_by_id(cdb_database_t* db, int column_id, const char* value) {
+    cdb_column_t* col = cdb_get_column_by_id(db, column_id);
+    if (!col || (col->data_type != CDB_TYPE_STRING && col->data_type != CDB_TYPE_STRING_DICT)) {
         set_error("Column not found or type mismatch");
         return -1;
     }
     
     if (expand_column_if_needed(col) < 0) return -1;
     
+    if (col->data_type == CDB_TYPE_STRING_DICT) {
+        uint32_t code;
+        if (cdb_string_dict_encode(col, value, &code) < 0) return -1;
+        ((uint32_t*)col->data)[col->num_rows] = code;
+        col->num_rows++;
+        return 0;
+    }
+    
     char** strings = (char**)col->data;
     char* str_copy = (char*)malloc(strlen(value) + 1);
     if (!str_copy) {
@@ -295,9 +638,14 @@ int cdb_insert_string(cdb_database_t* db, const char* column_name, const char* v
     return 0;
 }
 
-/* Insert bool */
-int cdb_insert_bool(cdb_database_t* db, const char* column_name, uint8_t value) {
-    cdb_column_t* col = cdb_get_column(db, column_name);
+/* Insert string by column name */
+int cdb_insert_string(cdb_database_t* db, const char* column_name, const char* value) {
+    return cdb_insert_string_by_id(db, cdb_get_column_index(db, column_name), value);
+}
+
+/* Insert bool by column id */
+int cdb_insert_bool_by_id(cdb_database_t* db, int column_id, uint8_t value) {
+    cdb_column_t* col = cdb_get_column_by_id(db, column_id);
     if (!col || col->data_type != CDB_TYPE_BOOL) {
         set_error("Column not found or type mismatch");
         return -1;
@@ -305,16 +653,20 @@ int cdb_insert_bool(cdb_database_t* db, const char* column_name, uint8_t value)
     
     if (expand_column_if_needed(col) < 0) return -1;
     
-    uint8_t* data = (uint8_t*)col->data;
-    data[col->num_rows] = value ? 1 : 0;
+    cdb_bool_set(col, col->num_rows, value);
     col->num_rows++;
     
     return 0;
 }
 
-/* Insert NULL */
-int cdb_insert_null(cdb_database_t* db, const char* column_name) {
-    cdb_column_t* col = cdb_get_column(db, column_name);
+/* Insert bool by column name */
+int cdb_insert_bool(cdb_database_t* db, const char* column_name, uint8_t value) {
+    return cdb_insert_bool_by_id(db, cdb_get_column_index(db, column_name), value);
+}
+
+/* Insert NULL by column id */
+int cdb_insert_null_by_id(cdb_database_t* db, int column_id) {
+    cdb_column_t* col = cdb_get_column_by_id(db, column_id);
     if (!col) {
         set_error("Column not found");
         return -1;
@@ -322,16 +674,17 @@ int cdb_insert_null(cdb_database_t* db, const char* column_name) {
     
     if (expand_column_if_needed(col) < 0) return -1;
     
-    /* Set null bit */
-    size_t byte_idx = col->num_rows / 8;
-    size_t bit_idx = col->num_rows % 8;
-    col->null_bitmap[byte_idx] |= (1 << bit_idx);
-    
+    cdb_column_set_null(col, col->num_rows);
     col->num_rows++;
     
     return 0;
 }
 
+/* Insert NULL by column name */
+int cdb_insert_null(cdb_database_t* db, const char* column_name) {
+    return cdb_insert_null_by_id(db, cdb_get_column_index(db, column_name));
+}
+
 /* Get int32 */
 int32_t cdb_get_int32(cdb_column_t* col, size_t row_index) {
     if (!col || col->data_type != CDB_TYPE_INT32 || row_index >= col->num_rows) {
@@ -370,7 +723,14 @@ double cdb_get_float64(cdb_column_t* col, size_t row_index) {
 
 /* Get string */
 char* cdb_get_string(cdb_column_t* col, size_t row_index) {
-    if (!col || col->data_type != CDB_TYPE_STRING || row_index >= col->num_rows) {
+    if (!col || row_index >= col->num_rows) {
+        return NULL;
+    }
+    if (col->data_type == CDB_TYPE_STRING_DICT) {
+        uint32_t code = ((uint32_t*)col->data)[row_index];
+        return code < col->dict->size ? col->dict->values[code] : NULL;
+    }
+    if (col->data_type != CDB_TYPE_STRING) {
         return NULL;
     }
     char** strings = (char**)col->data;
@@ -382,8 +742,8 @@ uint8_t cdb_get_bool(cdb_column_t* col, size_t row_index) {
     if (!col || col->data_type != CDB_TYPE_BOOL || row_index >= col->num_rows) {
         return 0;
     }
-    uint8_t* data = (uint8_t*)col->data;
-    return data[row_index];
+    const uint64_t* words = (const uint64_t*)col->data;
+    return (uint8_t)((words[row_index >> 6] >> (row_index & 63)) & 1);
 }
 
 /* Check if value is NULL */
@@ -397,6 +757,90 @@ int cdb_is_null(cdb_column_t* col, size_t row_index) {
     return (col->null_bitmap[byte_idx] >> bit_idx) & 1;
 }
 
+/* Count set bits in a 64-bit word */
+static inline size_t popcount64(uint64_t x) {
+#if defined(__GNUC__) || defined(__clang__)
+    return (size_t)__builtin_popcountll(x);
+#else
+    x = x - ((x >> 1) & 0x5555555555555555ULL);
+    x = (x & 0x3333333333333333ULL) + ((x >> 2) & 0x3333333333333333ULL);
+    x = (x + (x >> 4)) & 0x0f0f0f0f0f0f0f0fULL;
+    return (size_t)((x * 0x0101010101010101ULL) >> 56);
+#endif
+}
+
+/*
+ * Load the NULL bits of rows [64 * word_index, 64 * word_index + 64) as one
+ * word. The bitmap stays byte-addressed (that is the on-disk and buffer
+ * layout), so the last word of a column may be assembled from fewer bytes.
+ * Bits past num_rows are always clear.
+ */
+uint64_t cdb_null_word(const cdb_column_t* col, size_t word_index) {
+    size_t bitmap_size = (col->num_rows + 7) / 8;
+    size_t offset = word_index * sizeof(uint64_t);
+    uint64_t word = 0;
+    
+    if (offset >= bitmap_size) {
+        return 0;
+    }
+    if (bitmap_size - offset >= sizeof(uint64_t)) {
+        memcpy(&word, col->null_bitmap + offset, sizeof(uint64_t));
+    } else {
+        memcpy(&word, col->null_bitmap + offset, bitmap_size - offset);
+    }
+    return word;
+}
+
+/* Count NULL rows in a column, 64 rows at a time */
+size_t cdb_null_count(const cdb_column_t* col) {
+    if (!col || !col->has_any_null) {
+        return 0;
+    }
+    
+    size_t num_words = (col->num_rows + 63) / 64;
+    size_t total = 0;
+    for (size_t w = 0; w < num_words; w++) {
+        total += popcount64(cdb_null_word(col, w));
+    }
+    return total;
+}
+
+/* Recompute has_any_null from the bitmap after rows were loaded */
+void cdb_column_refresh_null_flag(cdb_column_t* col) {
+    size_t num_words = (col->num_rows + 63) / 64;
+    col->has_any_null = 0;
+    for (size_t w = 0; w < num_words; w++) {
+        if (cdb_null_word(col, w)) {
+            col->has_any_null = 1;
+            return;
+        }
+    }
+}
+
+/* Count TRUE rows of a BOOL column, 64 rows at a time, skipping NULL rows */
+size_t cdb_count_true(const cdb_column_t* col) {
+    if (!col || col->data_type != CDB_TYPE_BOOL) {
+        return 0;
+    }
+    
+    const uint64_t* words = (const uint64_t*)col->data;
+    size_t num_words = (col->num_rows + 63) / 64;
+    size_t total = 0;
+    for (size_t w = 0; w < num_words; w++) {
+        uint64_t word = words[w];
+        /* NULL rows normally store 0, but not in every file ever written */
+        if (col->has_any_null) {
+            word &= ~cdb_null_word(col, w);
+        }
+        /* Ignore whatever the last word holds past num_rows */
+        if (w == num_words - 1 && col->num_rows % 64) {
+            word &= (1ULL << (col->num_rows % 64)) - 1;
+        }
+        total += popcount64(word);
+    }
+    return total;
+}
+
 /* Get number of rows */
 size_t cdb_get_num_rows(cdb_database_t* db) {
     if (!db || db->num_columns == 0) {
@@ -3,15 +3,29 @@
  * Binary format: .cdb files
  */
 
+/* fileno, pwrite and ftruncate are POSIX, not C99 */
+#define _POSIX_C_SOURCE 200809L
+
 #include <stdlib.h>
 #include <string.h>
 #include <stdio.h>
 #include <time.h>
+#include <errno.h>
+#ifndef _WIN32
+#include <fcntl.h>
+#include <pthread.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#endif
 #include "../include/column_db.h"
 
 #define CDB_MAGIC_HEADER 0x43444201  /* "CDB\x01" */
 #define CDB_MAGIC_FOOTER 0x43444245  /* "CDBE" */
-#define CDB_VERSION 1
+#define CDB_VERSION 3
+#define CDB_HEADER_SIZE 32           /* magic, version, columns, rows, timestamp, flags, checksum */
+#define CDB_SAVE_THREADS 8           /* Upper bound on column writer threads */
+#define CDB_PARALLEL_SAVE_MIN_BYTES (1 << 20)  /* Smaller saves are written serially */
 
 /* Simple CRC32 implementation */
 static uint32_t crc32_table[256];
@@ -44,19 +58,188 @@ static uint32_t crc32(const uint8_t* data, size_t length) {
     return crc ^ 0xffffffff;
 }
 
-/* Save database to file */
-int cdb_save_to(cdb_database_t* db, const char* filename) {
-    if (!db || !filename) {
-        set_error("Invalid database or filename");
-        return -1;
+/* Round a file offset up to the next 8-byte boundary */
+static uint64_t align8(uint64_t offset) {
+    return (offset + 7) & ~(uint64_t)7;
+}
+
+/* Size of a column's data section on disk (excluding the null bitmap) */
+static uint64_t column_data_size(const cdb_column_t* col) {
+    uint64_t data_size = 0;
+    
+    switch (col->data_type) {
+        case CDB_TYPE_STRING: {
+            /* For strings, need length prefix for each */
+            char** strings = (char**)col->data;
+            for (size_t j = 0; j < col->num_rows; j++) {
+                data_size += sizeof(uint32_t);
+                if (strings[j]) data_size += strlen(strings[j]);
+            }
+            break;
+        }
+        case CDB_TYPE_STRING_DICT: {
+            /* Codes, then dictionary size and length-prefixed unique strings */
+            data_size = col->num_rows * sizeof(uint32_t) + sizeof(uint32_t);
+            for (uint32_t j = 0; j < col->dict->size; j++) {
+                data_size += sizeof(uint32_t) + strlen(col->dict->values[j]);
+            }
+            break;
+        }
+        default:
+            data_size = cdb_column_storage_size(col->data_type, col->num_rows);
     }
     
-    FILE* f = fopen(filename, "wb");
-    if (!f) {
-        set_error("Failed to open file for writing");
+    return data_size;
+}
+
+/* Write n bytes at a fixed file offset; on POSIX this is safe from several threads at once */
+static int write_at(FILE* f, uint64_t offset, const void* buf, size_t n) {
+#ifdef _WIN32
+    if (_fseeki64(f, (__int64)offset, SEEK_SET) != 0 || fwrite(buf, 1, n, f) != n) {
         return -1;
     }
+    return 0;
+#else
+    int fd = fileno(f);
+    const char* p = (const char*)buf;
+    while (n > 0) {
+        ssize_t written = pwrite(fd, p, n, (off_t)offset);
+        if (written < 0) {
+            if (errno == EINTR) continue;
+            return -1;
+        }
+        p += written;
+        offset += (uint64_t)written;
+        n -= (size_t)written;
+    }
+    return 0;
+#endif
+}
+
+/* Serialize a string column's data section into buf (data_size bytes) */
+static void serialize_strings(const cdb_column_t* col, char* buf) {
+    char* p = buf;
+    
+    if (col->data_type == CDB_TYPE_STRING_DICT) {
+        /* Codes first so they stay aligned, then the dictionary once */
+        memcpy(p, col->data, col->num_rows * sizeof(uint32_t));
+        p += col->num_rows * sizeof(uint32_t);
+        memcpy(p, &col->dict->size, sizeof(uint32_t));
+        p += sizeof(uint32_t);
+        for (uint32_t j = 0; j < col->dict->size; j++) {
+            uint32_t str_len = (uint32_t)strlen(col->dict->values[j]);
+            memcpy(p, &str_len, sizeof(uint32_t));
+            memcpy(p + sizeof(uint32_t), col->dict->values[j], str_len);
+            p += sizeof(uint32_t) + str_len;
+        }
+        return;
+    }
     
+    /* Strings with length prefix */
+    char** strings = (char**)col->data;
+    for (size_t j = 0; j < col->num_rows; j++) {
+        uint32_t str_len = strings[j] ? (uint32_t)strlen(strings[j]) : 0;
+        memcpy(p, &str_len, sizeof(uint32_t));
+        if (str_len > 0) {
+            memcpy(p + sizeof(uint32_t), strings[j], str_len);
+        }
+        p += sizeof(uint32_t) + str_len;
+    }
+}
+
+/* Write one column's data section and null bitmap at its directory offset */
+static int write_column(FILE* f, const cdb_column_t* col, uint64_t offset, uint64_t data_size) {
+    if (col->data_type == CDB_TYPE_STRING || col->data_type == CDB_TYPE_STRING_DICT) {
+        char* buf = (char*)malloc(data_size ? (size_t)data_size : 1);
+        if (!buf) return -1;
+        serialize_strings(col, buf);
+        int rc = write_at(f, offset, buf, (size_t)data_size);
+        free(buf);
+        if (rc < 0) return -1;
+    } else {
+        /* Write binary data directly */
+        if (write_at(f, offset, col->data, (size_t)data_size) < 0) return -1;
+    }
+    
+    return write_at(f, offset + data_size, col->null_bitmap, (col->num_rows + 7) / 8);
+}
+
+/* A share of the columns to write: columns first, first + step, ... */
+typedef struct {
+    FILE* f;
+    const cdb_database_t* db;
+    const uint64_t* offsets;
+    const uint64_t* sizes;
+    size_t first;
+    size_t step;
+    int failed;
+} cdb_save_job_t;
+
+static void* save_worker(void* arg) {
+    cdb_save_job_t* job = (cdb_save_job_t*)arg;
+    for (size_t i = job->first; i < job->db->num_columns; i += job->step) {
+        if (write_column(job->f, &job->db->columns[i], job->offsets[i], job->sizes[i]) < 0) {
+            job->failed = 1;
+            break;
+        }
+    }
+    return NULL;
+}
+
+/*
+ * Write every column's section. Sections have fixed offsets, so wide or
+ * large tables are written by several threads at once with pwrite().
+ */
+static int write_columns(FILE* f, const cdb_database_t* db, const uint64_t* offsets,
+                         const uint64_t* sizes, uint64_t total_bytes) {
+    size_t num_threads = 1;
+#ifndef _WIN32
+    if (total_bytes >= CDB_PARALLEL_SAVE_MIN_BYTES) {
+        num_threads = db->num_columns < CDB_SAVE_THREADS ? db->num_columns : CDB_SAVE_THREADS;
+    }
+#endif
+    
+    cdb_save_job_t jobs[CDB_SAVE_THREADS];
+    for (size_t t = 0; t < num_threads; t++) {
+        jobs[t] = (cdb_save_job_t){ f, db, offsets, sizes, t, num_threads, 0 };
+    }
+    
+#ifndef _WIN32
+    pthread_t threads[CDB_SAVE_THREADS];
+    int started[CDB_SAVE_THREADS] = {0};
+    for (size_t t = 1; t < num_threads; t++) {
+        started[t] = pthread_create(&threads[t], NULL, save_worker, &jobs[t]) == 0;
+    }
+#endif
+    
+    save_worker(&jobs[0]);
+    
+    int failed = jobs[0].failed;
+#ifndef _WIN32
+    for (size_t t = 1; t < num_threads; t++) {
+        if (started[t]) {
+            pthread_join(threads[t], NULL);
+        } else {
+            /* Couldn't start a thread: do its share here */
+            save_worker(&jobs[t]);
+        }
+        failed |= jobs[t].failed;
+    }
+#endif
+    
+    return failed ? -1 : 0;
+}
+
+/*
+ * Write the database to f and close it
+ *
+ * Layout (version 3): a fixed header, then a column directory giving each
+ * column's type, name and the offset and size of its data, then each
+ * column's data followed by its null bitmap. Column data starts on an
+ * 8-byte boundary, so fixed-width columns can be used in place from a
+ * memory-mapped file. BOOL data is the bit-packed uint64_t words.
+ */
+static int write_database(cdb_database_t* db, FILE* f) {
     /* Get current time */
     time_t now = time(NULL);
     
@@ -64,23 +247,38 @@ int cdb_save_to(cdb_database_t* db, const char* filename) {
     uint32_t magic = CDB_MAGIC_HEADER;
     uint32_t version = CDB_VERSION;
     uint32_t num_cols = db->num_columns;
-    uint32_t num_rows = db->columns[0].num_rows;
+    uint32_t num_rows = db->num_columns ? db->columns[0].num_rows : 0;
+    uint64_t timestamp = (uint64_t)now;
     
     fwrite(&magic, sizeof(uint32_t), 1, f);
     fwrite(&version, sizeof(uint32_t), 1, f);
     fwrite(&num_cols, sizeof(uint32_t), 1, f);
     fwrite(&num_rows, sizeof(uint32_t), 1, f);
-    fwrite(&now, sizeof(uint64_t), 1, f);
+    fwrite(&timestamp, sizeof(uint64_t), 1, f);
     
     uint32_t flags = 0;
     fwrite(&flags, sizeof(uint32_t), 1, f);
     
-    /* Placeholder for header checksum (will update later) */
+    /* Placeholder for header checksum */
     uint32_t header_checksum = 0;
-    long checksum_pos = ftell(f);
     fwrite(&header_checksum, sizeof(uint32_t), 1, f);
     
-    /* Write column metadata */
+    uint64_t* offsets = (uint64_t*)malloc((db->num_columns ? db->num_columns : 1) * 2 * sizeof(uint64_t));
+    if (!offsets) {
+        set_error("Failed to allocate column directory");
+        fclose(f);
+        return -1;
+    }
+    uint64_t* sizes = offsets + db->num_columns;
+    
+    /* The directory size is known up front, so data offsets can be assigned now */
+    uint64_t offset = CDB_HEADER_SIZE;
+    for (size_t i = 0; i < db->num_columns; i++) {
+        offset += sizeof(uint8_t) + sizeof(uint16_t) + strlen(db->columns[i].name) + 3 * sizeof(uint64_t);
+    }
+    offset = align8(offset);
+    
+    /* Write column directory */
     for (size_t i = 0; i < db->num_columns; i++) {
         cdb_column_t* col = &db->columns[i];
         
@@ -91,223 +289,505 @@ int cdb_save_to(cdb_database_t* db, const char* filename) {
         fwrite(&name_len, sizeof(uint16_t), 1, f);
         fwrite(col->name, sizeof(char), name_len, f);
         
-        /* Calculate data size */
-        uint64_t data_offset = ftell(f) + 24;  /* Will be filled later */
-        uint64_t data_size = 0;
-        
-        switch (col->data_type) {
-            case CDB_TYPE_INT32:
-                data_size = col->num_rows * sizeof(int32_t);
-                break;
-            case CDB_TYPE_INT64:
-                data_size = col->num_rows * sizeof(int64_t);
-                break;
-            case CDB_TYPE_FLOAT32:
-                data_size = col->num_rows * sizeof(float);
-                break;
-            case CDB_TYPE_FLOAT64:
-                data_size = col->num_rows * sizeof(double);
-                break;
-            case CDB_TYPE_STRING: {
-                /* For strings, need length prefix for each */
-                for (size_t j = 0; j < col->num_rows; j++) {
-                    char** strings = (char**)col->data;
-                    if (strings[j]) {
-                        data_size += sizeof(uint32_t) + strlen(strings[j]);
-                    } else {
-                        data_size += sizeof(uint32_t);
-                    }
-                }
-                break;
-            }
-            case CDB_TYPE_BOOL:
-                data_size = col->num_rows * sizeof(uint8_t);
-                break;
-        }
-        
+        uint64_t data_offset = offset;
+        uint64_t data_size = column_data_size(col);
         uint64_t null_bitmap_size = (col->num_rows + 7) / 8;
         
         fwrite(&data_offset, sizeof(uint64_t), 1, f);
         fwrite(&data_size, sizeof(uint64_t), 1, f);
         fwrite(&null_bitmap_size, sizeof(uint64_t), 1, f);
+        
+        offsets[i] = data_offset;
+        sizes[i] = data_size;
+        offset = align8(data_offset + data_size + null_bitmap_size);
     }
     
-    /* Write column data */
-    for (size_t i = 0; i < db->num_columns; i++) {
-        cdb_column_t* col = &db->columns[i];
-        
-        if (col->data_type == CDB_TYPE_STRING) {
-            /* Write strings with length prefix */
-            for (size_t j = 0; j < col->num_rows; j++) {
-                char** strings = (char**)col->data;
-                uint32_t str_len = strings[j] ? (uint32_t)strlen(strings[j]) : 0;
-                fwrite(&str_len, sizeof(uint32_t), 1, f);
-                if (str_len > 0) {
-                    fwrite(strings[j], sizeof(char), str_len, f);
-                }
-            }
-        } else {
-            /* Write binary data directly */
-            size_t element_size = 0;
-            switch (col->data_type) {
-                case CDB_TYPE_INT32: element_size = sizeof(int32_t); break;
-                case CDB_TYPE_INT64: element_size = sizeof(int64_t); break;
-                case CDB_TYPE_FLOAT32: element_size = sizeof(float); break;
-                case CDB_TYPE_FLOAT64: element_size = sizeof(double); break;
-                case CDB_TYPE_BOOL: element_size = sizeof(uint8_t); break;
-                default: element_size = 0;
-            }
-            
-            if (element_size > 0) {
-                fwrite(col->data, element_size, col->num_rows, f);
-            }
-        }
-        
-        /* Write null bitmap */
-        uint64_t bitmap_size = (col->num_rows + 7) / 8;
-        fwrite(col->null_bitmap, sizeof(uint8_t), bitmap_size, f);
+    /* Header and directory go through stdio; sections are written at their offsets */
+    uint64_t data_start = db->num_columns ? offsets[0] : offset;
+    uint64_t file_size = offset + 16;  /* +16 for footer */
+    int sized = fflush(f) == 0;
+#ifndef _WIN32
+    /* Size the file once up front rather than extending it from several threads */
+    sized = sized && ftruncate(fileno(f), (off_t)file_size) == 0;
+#endif
+    if (!sized) {
+        set_error("Failed to write database file");
+        free(offsets);
+        fclose(f);
+        return -1;
     }
     
-    /* Calculate file size for footer */
-    uint64_t file_size = ftell(f) + 16;  /* +16 for footer */
+    int rc = write_columns(f, db, offsets, sizes, offset - data_start);
+    free(offsets);
     
     /* Write footer */
+    uint8_t footer[16];
     uint32_t footer_magic = CDB_MAGIC_FOOTER;
-    fwrite(&footer_magic, sizeof(uint32_t), 1, f);
-    fwrite(&file_size, sizeof(uint64_t), 1, f);
-    
-    /* Calculate overall checksum */
     uint32_t file_checksum = 0;  /* TODO: implement full checksum */
-    fwrite(&file_checksum, sizeof(uint32_t), 1, f);
+    memcpy(footer, &footer_magic, sizeof(uint32_t));
+    memcpy(footer + 4, &file_size, sizeof(uint64_t));
+    memcpy(footer + 12, &file_checksum, sizeof(uint32_t));
+    if (rc == 0) {
+        rc = write_at(f, offset, footer, sizeof(footer));
+    }
     
-    fclose(f);
+    if (fclose(f) != 0 || rc < 0) {
+        set_error("Failed to write database file");
+        return -1;
+    }
     return 0;
 }
 
-/* Load database from file */
-int cdb_load_from(cdb_database_t* db, const char* filename) {
+/* Create a new file next to filename for the database to be written to; *tmp_name must be freed */
+static FILE* open_temp_file(const char* filename, char** tmp_name) {
+    size_t size = strlen(filename) + 32;
+    char* name = (char*)malloc(size);
+    if (!name) {
+        set_error("Failed to allocate file name");
+        return NULL;
+    }
+    
+#ifdef _WIN32
+    snprintf(name, size, "%s.tmp", filename);
+    FILE* f = fopen(name, "wb");
+#else
+    /* O_EXCL makes concurrent saves to the same path pick distinct names */
+    int fd = -1;
+    for (unsigned attempt = 0; fd < 0 && attempt < 100; attempt++) {
+        snprintf(name, size, "%s.%ld.%u.tmp", filename, (long)getpid(), attempt);
+        fd = open(name, O_WRONLY | O_CREAT | O_EXCL, 0666);
+        if (fd < 0 && errno != EEXIST) break;
+    }
+    FILE* f = NULL;
+    if (fd >= 0) {
+        /* Keep the permissions of the file being replaced */
+        struct stat st;
+        if (stat(filename, &st) == 0) {
+            fchmod(fd, st.st_mode & 07777);
+        }
+        f = fdopen(fd, "wb");
+        if (!f) {
+            close(fd);
+            remove(name);
+        }
+    }
+#endif
+    if (!f) {
+        set_error("Failed to open file for writing");
+        free(name);
+        return NULL;
+    }
+    
+    *tmp_name = name;
+    return f;
+}
+
+/*
+ * Save database to file
+ *
+ * The file is written under a temporary name and renamed over filename, so
+ * databases that still map the old file (this one included) keep reading
+ * the old contents instead of a truncated or rewritten file.
+ */
+int cdb_save_to(cdb_database_t* db, const char* filename) {
     if (!db || !filename) {
         set_error("Invalid database or filename");
         return -1;
     }
     
+    char* tmp_name;
+    FILE* f = open_temp_file(filename, &tmp_name);
+    if (!f) {
+        return -1;
+    }
+    
+    int rc = write_database(db, f);
+#ifdef _WIN32
+    /* rename() does not replace an existing file here */
+    if (rc == 0) {
+        remove(filename);
+    }
+#endif
+    if (rc == 0 && rename(tmp_name, filename) != 0) {
+        set_error("Failed to replace database file");
+        rc = -1;
+    }
+    if (rc < 0) {
+        remove(tmp_name);
+    }
+    free(tmp_name);
+    return rc;
+}
+
+/* Map a whole file read-only (or read it into memory where mmap is unavailable) */
+static int map_file(const char* filename, uint8_t** base, size_t* size) {
+#ifdef _WIN32
     FILE* f = fopen(filename, "rb");
     if (!f) {
         set_error("Failed to open file for reading");
         return -1;
     }
     
+    fseek(f, 0, SEEK_END);
+    long length = ftell(f);
+    fseek(f, 0, SEEK_SET);
+    
+    *base = (uint8_t*)malloc(length > 0 ? (size_t)length : 1);
+    if (!*base) {
+        set_error("Failed to allocate file buffer");
+        fclose(f);
+        return -1;
+    }
+    *size = fread(*base, 1, (size_t)length, f);
+    fclose(f);
+    return 0;
+#else
+    int fd = open(filename, O_RDONLY);
+    if (fd < 0) {
+        set_error("Failed to open file for reading");
+        return -1;
+    }
+    
+    struct stat st;
+    if (fstat(fd, &st) < 0 || st.st_size == 0) {
+        set_error("Invalid CDB file format");
+        close(fd);
+        return -1;
+    }
+    
+    void* map = mmap(NULL, (size_t)st.st_size, PROT_READ, MAP_PRIVATE, fd, 0);
+    close(fd);
+    if (map == MAP_FAILED) {
+        set_error("Failed to map file");
+        return -1;
+    }
+    
+    *base = (uint8_t*)map;
+    *size = (size_t)st.st_size;
+    return 0;
+#endif
+}
+
+/* Release the file a database was loaded from, if it is still mapped */
+void cdb_release_mapping(cdb_database_t* db) {
+    if (!db || !db->mapping) return;
+    
+#ifdef _WIN32
+    free(db->mapping);
+#else
+    munmap(db->mapping, db->mapping_size);
+#endif
+    db->mapping = NULL;
+    db->mapping_size = 0;
+}
+
+/* Bounds-checked reader over a loaded file */
+typedef struct {
+    const uint8_t* pos;
+    const uint8_t* end;
+} cdb_reader_t;
+
+static int read_bytes(cdb_reader_t* r, void* dst, size_t n) {
+    if ((size_t)(r->end - r->pos) < n) {
+        set_error("Truncated CDB file");
+        return -1;
+    }
+    memcpy(dst, r->pos, n);
+    r->pos += n;
+    return 0;
+}
+
+/* Location of a column's data in the file, from the column directory */
+typedef struct {
+    uint64_t data_offset;
+    uint64_t data_size;
+    uint64_t null_bitmap_size;
+} cdb_dir_entry_t;
+
+/* Read length-prefixed strings into a STRING column */
+static int load_strings(cdb_column_t* col, cdb_reader_t* r, uint32_t num_rows) {
+    if (cdb_column_reserve(col, num_rows) < 0) return -1;
+    
+    char** strings = (char**)col->data;
+    for (uint32_t j = 0; j < num_rows; j++) {
+        uint32_t str_len;
+        if (read_bytes(r, &str_len, sizeof(uint32_t)) < 0) return -1;
+        
+        char* str = (char*)malloc((size_t)str_len + 1);
+        if (!str) {
+            set_error("Failed to allocate string");
+            return -1;
+        }
+        if (read_bytes(r, str, str_len) < 0) {
+            free(str);
+            return -1;
+        }
+        str[str_len] = '\0';
+        strings[j] = str;
+        col->num_rows = j + 1;  /* so the string is freed with the column on failure */
+    }
+    return 0;
+}
+
+/* Rebuild a STRING_DICT column's dictionary; entries are unique so codes come back in order */
+static int load_dictionary(cdb_column_t* col, cdb_reader_t* r) {
+    uint32_t dict_size;
+    if (read_bytes(r, &dict_size, sizeof(uint32_t)) < 0) return -1;
+    
+    for (uint32_t j = 0; j < dict_size; j++) {
+        uint32_t str_len, code;
+        if (read_bytes(r, &str_len, sizeof(uint32_t)) < 0) return -1;
+        
+        char* str = (char*)malloc((size_t)str_len + 1);
+        if (!str) {
+            set_error("Failed to allocate string");
+            return -1;
+        }
+        if (read_bytes(r, str, str_len) < 0) {
+            free(str);
+            return -1;
+        }
+        str[str_len] = '\0';
+        
+        int rc = cdb_string_dict_encode(col, str, &code);
+        free(str);
+        if (rc < 0) return -1;
+    }
+    return 0;
+}
+
+/*
+ * Load fixed-width rows. When the rows are suitably aligned in the file
+ * they are used in place, so only the pages that are actually read get
+ * faulted in; otherwise (or when attached is NULL) they are copied.
+ */
+static int load_fixed(cdb_column_t* col, const uint8_t* data, uint32_t num_rows, int* attached) {
+    /* BOOL storage is uint64_t words */
+    size_t alignment = col->data_type == CDB_TYPE_BOOL ? sizeof(uint64_t) : cdb_type_size(col->data_type);
+    
+    if (attached && num_rows > 0 && (uintptr_t)data % alignment == 0) {
+        if (cdb_column_attach(col, (void*)data, num_rows) < 0) return -1;
+        *attached = 1;
+        return 0;
+    }
+    
+    if (cdb_column_reserve(col, num_rows) < 0) return -1;
+    memcpy(col->data, data, cdb_column_storage_size(col->data_type, num_rows));
+    return 0;
+}
+
+/* Load one column's data and null bitmap */
+static int load_column(cdb_column_t* col, const uint8_t* base, const cdb_dir_entry_t* entry,
+                       uint32_t version, uint32_t num_rows, int* attached) {
+    const uint8_t* data = base + entry->data_offset;
+    cdb_reader_t r = { data, data + entry->data_size };
+    size_t element_size = cdb_type_size(col->data_type);
+    
+    if (col->data_type == CDB_TYPE_STRING) {
+        if (load_strings(col, &r, num_rows) < 0) return -1;
+    } else if (col->data_type == CDB_TYPE_STRING_DICT) {
+        if (entry->data_size < (uint64_t)num_rows * element_size) {
+            set_error("Truncated CDB file");
+            return -1;
+        }
+        if (load_fixed(col, data, num_rows, attached) < 0) return -1;
+        r.pos += (size_t)num_rows * element_size;
+        if (load_dictionary(col, &r) < 0) return -1;
+    } else if (col->data_type == CDB_TYPE_BOOL && version == 1) {
+        /* Version 1 stored one byte per bool */
+        if (entry->data_size < (uint64_t)num_rows) {
+            set_error("Truncated CDB file");
+            return -1;
+        }
+        if (cdb_column_reserve(col, num_rows) < 0) return -1;
+        cdb_bool_pack(col, 0, data, num_rows);
+    } else {
+        if (entry->data_size < cdb_column_storage_size(col->data_type, num_rows)) {
+            set_error("Truncated CDB file");
+            return -1;
+        }
+        /* Version 1 rows are copied so their NULL slots can be cleared below */
+        if (load_fixed(col, data, num_rows, version == 1 ? NULL : attached) < 0) return -1;
+    }
+    
+    /* Read null bitmap */
+    if (entry->null_bitmap_size < ((uint64_t)num_rows + 7) / 8) {
+        set_error("Truncated CDB file");
+        return -1;
+    }
+    memcpy(col->null_bitmap, data + entry->data_size, ((size_t)num_rows + 7) / 8);
+    
+    /* Set row count */
+    col->num_rows = num_rows;
+    cdb_column_refresh_null_flag(col);
+    
+    /* Version 1 left whatever was in memory under NULL rows; store 0 as later versions do */
+    if (version == 1 && col->has_any_null && col->data_type != CDB_TYPE_STRING) {
+        for (uint32_t j = 0; j < num_rows; j++) {
+            if (cdb_is_null(col, j)) {
+                cdb_column_set_null(col, j);
+            }
+        }
+    }
+    
+    /* Reject dictionary codes that don't refer to an entry */
+    if (col->data_type == CDB_TYPE_STRING_DICT) {
+        const uint32_t* codes = (const uint32_t*)col->data;
+        for (uint32_t j = 0; j < num_rows; j++) {
+            if (codes[j] >= col->dict->size && !cdb_is_null(col, j)) {
+                set_error("Invalid dictionary code in CDB file");
+                return -1;
+            }
+        }
+    }
+    
+    return 0;
+}
+
+/*
+ * Load database from file
+ *
+ * The file is memory-mapped and only the header and column directory are
+ * parsed eagerly. Fixed-width columns point straight into the mapping, so
+ * loading costs O(header) and column pages are read on first access;
+ * appending to such a column first copies it to the heap. String columns
+ * are decoded into owned storage.
+ */
+int cdb_load_from(cdb_database_t* db, const char* filename) {
+    if (!db || !filename) {
+        set_error("Invalid database or filename");
+        return -1;
+    }
+    if (db->mapping) {
+        set_error("Database already has a file loaded");
+        return -1;
+    }
+    
+    uint8_t* base;
+    size_t size;
+    if (map_file(filename, &base, &size) < 0) {
+        return -1;
+    }
+    /* Owned by the database from here on, so every exit path below is covered */
+    db->mapping = base;
+    db->mapping_size = size;
+    
+    cdb_reader_t r = { base, base + size };
+    cdb_dir_entry_t* entries = NULL;
+    int attached = 0;
+    
     /* Read and verify header */
     uint32_t magic, version, num_cols, num_rows;
     uint64_t timestamp;
     uint32_t flags, header_checksum;
     
-    fread(&magic, sizeof(uint32_t), 1, f);
+    if (read_bytes(&r, &magic, sizeof(uint32_t)) < 0) goto fail;
     if (magic != CDB_MAGIC_HEADER) {
         set_error("Invalid CDB file format");
-        fclose(f);
-        return -1;
+        goto fail;
     }
     
-    fread(&version, sizeof(uint32_t), 1, f);
-    if (version != CDB_VERSION) {
+    if (read_bytes(&r, &version, sizeof(uint32_t)) < 0) goto fail;
+    /* Version 2 was never released */
+    if (version != 1 && version != CDB_VERSION) {
         set_error("Unsupported CDB file version");
-        fclose(f);
-        return -1;
+        goto fail;
     }
     
-    fread(&num_cols, sizeof(uint32_t), 1, f);
-    fread(&num_rows, sizeof(uint32_t), 1, f);
-    fread(&timestamp, sizeof(uint64_t), 1, f);
-    fread(&flags, sizeof(uint32_t), 1, f);
-    fread(&header_checksum, sizeof(uint32_t), 1, f);
+    if (read_bytes(&r, &num_cols, sizeof(uint32_t)) < 0 ||
+        read_bytes(&r, &num_rows, sizeof(uint32_t)) < 0 ||
+        read_bytes(&r, &timestamp, sizeof(uint64_t)) < 0 ||
+        read_bytes(&r, &flags, sizeof(uint32_t)) < 0 ||
+        read_bytes(&r, &header_checksum, sizeof(uint32_t)) < 0) {
+        goto fail;
+    }
     
-    /* Read column metadata and create columns */
+    entries = (cdb_dir_entry_t*)calloc(num_cols ? num_cols : 1, sizeof(cdb_dir_entry_t));
+    if (!entries) {
+        set_error("Failed to allocate column directory");
+        goto fail;
+    }
+    
+    /* Read column directory and create columns */
+    size_t first_column = db->num_columns;
     for (uint32_t i = 0; i < num_cols; i++) {
         uint8_t dtype;
         uint16_t name_len;
         
-        fread(&dtype, sizeof(uint8_t), 1, f);
-        fread(&name_len, sizeof(uint16_t), 1, f);
+        if (read_bytes(&r, &dtype, sizeof(uint8_t)) < 0 ||
+            read_bytes(&r, &name_len, sizeof(uint16_t)) < 0) {
+            goto fail;
+        }
         
         char* col_name = (char*)malloc(name_len + 1);
         if (!col_name) {
             set_error("Failed to allocate column name");
-            fclose(f);
-            return -1;
+            goto fail;
         }
         
-        fread(col_name, sizeof(char), name_len, f);
+        if (read_bytes(&r, col_name, name_len) < 0) {
+            free(col_name);
+            goto fail;
+        }
         col_name[name_len] = '\0';
         
-        uint64_t data_offset, data_size, null_bitmap_size;
-        fread(&data_offset, sizeof(uint64_t), 1, f);
-        fread(&data_size, sizeof(uint64_t), 1, f);
-        fread(&null_bitmap_size, sizeof(uint64_t), 1, f);
+        if (read_bytes(&r, &entries[i].data_offset, sizeof(uint64_t)) < 0 ||
+            read_bytes(&r, &entries[i].data_size, sizeof(uint64_t)) < 0 ||
+            read_bytes(&r, &entries[i].null_bitmap_size, sizeof(uint64_t)) < 0) {
+            free(col_name);
+            goto fail;
+        }
         
-        /* Add column */
-        if (cdb_add_column(db, col_name, (cdb_data_type_t)dtype) < 0) {
+        if (version == 1 && dtype == CDB_TYPE_STRING_DICT) {
             free(col_name);
-            fclose(f);
-            return -1;
+            set_error("STRING_DICT columns require a version 3 CDB file");
+            goto fail;
         }
         
+        /* Add column */
+        int rc = cdb_add_column(db, col_name, (cdb_data_type_t)dtype);
         free(col_name);
+        if (rc < 0) goto fail;
     }
     
-    /* Read column data */
-    for (size_t i = 0; i < db->num_columns; i++) {
-        cdb_column_t* col = &db->columns[i];
-        
-        if (col->data_type == CDB_TYPE_STRING) {
-            /* Read strings with length prefix */
-            char** strings = (char**)col->data;
-            for (uint32_t j = 0; j < num_rows; j++) {
-                uint32_t str_len;
-                fread(&str_len, sizeof(uint32_t), 1, f);
-                
-                if (str_len > 0) {
-                    char* str = (char*)malloc(str_len + 1);
-                    if (!str) {
-                        set_error("Failed to allocate string");
-                        fclose(f);
-                        return -1;
-                    }
-                    fread(str, sizeof(char), str_len, f);
-                    str[str_len] = '\0';
-                    strings[j] = str;
-                } else {
-                    strings[j] = (char*)malloc(1);
-                    if (strings[j]) strings[j][0] = '\0';
-                }
-            }
-        } else {
-            /* Read binary data */
-            size_t element_size = 0;
-            switch (col->data_type) {
-                case CDB_TYPE_INT32: element_size = sizeof(int32_t); break;
-                case CDB_TYPE_INT64: element_size = sizeof(int64_t); break;
-                case CDB_TYPE_FLOAT32: element_size = sizeof(float); break;
-                case CDB_TYPE_FLOAT64: element_size = sizeof(double); break;
-                case CDB_TYPE_BOOL: element_size = sizeof(uint8_t); break;
-                default: element_size = 0;
-            }
-            
-            if (element_size > 0) {
-                fread(col->data, element_size, num_rows, f);
-            }
+    /* Version 1 stored columns back to back without usable offsets */
+    if (version == 1) {
+        uint64_t offset = (uint64_t)(r.pos - base);
+        for (uint32_t i = 0; i < num_cols; i++) {
+            entries[i].data_offset = offset;
+            offset += entries[i].data_size + entries[i].null_bitmap_size;
+        }
+    }
+    
+    /* Load column data */
+    for (uint32_t i = 0; i < num_cols; i++) {
+        const cdb_dir_entry_t* entry = &entries[i];
+        if (entry->data_offset > size ||
+            entry->data_size > size - entry->data_offset ||
+            entry->null_bitmap_size > size - entry->data_offset - entry->data_size) {
+            set_error("Truncated CDB file");
+            goto fail;
         }
         
-        /* Read null bitmap */
-        uint64_t bitmap_size = (num_rows + 7) / 8;
-        fread(col->null_bitmap, sizeof(uint8_t), bitmap_size, f);
-        
-        /* Set row count */
-        col->num_rows = num_rows;
+        if (load_column(&db->columns[first_column + i], base, entry, version, num_rows, &attached) < 0) {
+            goto fail;
+        }
     }
     
-    fclose(f);
+    free(entries);
+    
+    /* Nothing points into the file (e.g. only string columns), so drop it now */
+    if (!attached) {
+        cdb_release_mapping(db);
+    }
     return 0;
+    
+fail:
+    free(entries);
+    if (!attached) {
+        cdb_release_mapping(db);
+    }
+    return -1;
 }
 
 /* Backwards compatibility: open loads from file */
@@ -1,5 +1,6 @@
 #define PY_SSIZE_T_CLEAN
 #include <Python.h>
+#include <errno.h>
 #include "../include/column_db.h"
 
 /* Python C extension for ColumnDB */
@@ -7,8 +8,13 @@
 typedef struct {
     PyObject_HEAD
     cdb_database_t* db;
+    PyThread_type_lock lock; /* Held while a method runs on db without the GIL */
+    int busy;                /* Set (under the GIL) while that is happening */
 } PyColumnDBObject;
 
+/* Copies smaller than this aren't worth dropping the GIL for */
+#define NOGIL_MIN_BYTES (64 * 1024)
+
 /* Forward declarations */
 static PyTypeObject PyColumnDBType;
 
@@ -17,7 +23,9 @@ static PyObject* PyColumnDB_new(PyTypeObject* type, PyObject* args, PyObject* kw
     PyColumnDBObject* self = (PyColumnDBObject*)type->tp_alloc(type, 0);
     if (self != NULL) {
         self->db = cdb_create_database();
-        if (self->db == NULL) {
+        self->lock = PyThread_allocate_lock();
+        self->busy = 0;
+        if (self->db == NULL || self->lock == NULL) {
             Py_DECREF(self);
             return PyErr_NoMemory();
         }
@@ -30,11 +38,48 @@ static void PyColumnDB_dealloc(PyColumnDBObject* self) {
     if (self->db != NULL) {
         cdb_free_database(self->db);
     }
+    if (self->lock != NULL) {
+        PyThread_free_lock(self->lock);
+    }
     Py_TYPE(self)->tp_free((PyObject*)self);
 }
 
+/*
+ * Bulk operations (save, load, large buffer copies) drop the GIL so other
+ * Python threads keep running. Every method first waits for any such
+ * operation on the same object to finish, so db is never touched from two
+ * threads at once. The check is a single flag test when nothing is running.
+ */
+static void wait_until_idle(PyColumnDBObject* self) {
+    while (self->busy) {
+        Py_BEGIN_ALLOW_THREADS
+        PyThread_acquire_lock(self->lock, WAIT_LOCK);
+        PyThread_release_lock(self->lock);
+        Py_END_ALLOW_THREADS
+    }
+}
+
+#define ENSURE_IDLE(self) do { if ((self)->busy) wait_until_idle(self); } while (0)
+
+/* Take exclusive use of db and release the GIL */
+static PyThreadState* release_gil(PyColumnDBObject* self) {
+    ENSURE_IDLE(self);
+    PyThread_acquire_lock(self->lock, WAIT_LOCK);
+    self->busy = 1;
+    return PyEval_SaveThread();
+}
+
+/* Reacquire the GIL and let other threads use db again */
+static void reacquire_gil(PyColumnDBObject* self, PyThreadState* state) {
+    PyEval_RestoreThread(state);
+    self->busy = 0;
+    PyThread_release_lock(self->lock);
+}
+
 /* Add column method */
 static PyObject* PyColumnDB_add_column(PyColumnDBObject* self, PyObject* args) {
+    ENSURE_IDLE(self);
+    
     const char* name;
     int type;
     
@@ -42,7 +87,7 @@ static PyObject* PyColumnDB_add_column(PyColumnDBObject* self, PyObject* args) {
         return NULL;
     }
     
-    if (type < CDB_TYPE_INT32 || type > CDB_TYPE_BOOL) {
+    if (type < CDB_TYPE_INT32 || type > CDB_TYPE_STRING_DICT) {
         PyErr_SetString(PyExc_ValueError, "Invalid data type");
         return NULL;
     }
@@ -55,8 +100,65 @@ static PyObject* PyColumnDB_add_column(PyColumnDBObject* self, PyObject* args) {
     Py_RETURN_NONE;
 }
 
+/* Add several columns from a sequence of (name, type) pairs */
+static PyObject* PyColumnDB_add_columns(PyColumnDBObject* self, PyObject* args) {
+    ENSURE_IDLE(self);
+    
+    PyObject* schema;
+    
+    if (!PyArg_ParseTuple(args, "O", &schema)) {
+        return NULL;
+    }
+    
+    PyObject* seq = PySequence_Fast(schema, "schema must be a sequence of (name, type) pairs");
+    if (!seq) {
+        return NULL;
+    }
+    
+    Py_ssize_t count = PySequence_Fast_GET_SIZE(seq);
+    PyObject** items = PySequence_Fast_ITEMS(seq);
+    const char** names = PyMem_Malloc((count ? count : 1) * sizeof(char*));
+    cdb_data_type_t* types = PyMem_Malloc((count ? count : 1) * sizeof(cdb_data_type_t));
+    if (!names || !types) {
+        PyMem_Free(names);
+        PyMem_Free(types);
+        Py_DECREF(seq);
+        return PyErr_NoMemory();
+    }
+    
+    PyObject* result = NULL;
+    for (Py_ssize_t i = 0; i < count; i++) {
+        int type;
+        /* Names stay valid while seq keeps the pair tuples alive */
+        if (!PyArg_ParseTuple(items[i], "si;schema entries must be (name, type) pairs", &names[i], &type)) {
+            goto done;
+        }
+        if (type < CDB_TYPE_INT32 || type > CDB_TYPE_STRING_DICT) {
+            PyErr_SetString(PyExc_ValueError, "Invalid data type");
+            goto done;
+        }
+        types[i] = (cdb_data_type_t)type;
+    }
+    
+    if (cdb_add_columns(self->db, names, types, (size_t)count) < 0) {
+        PyErr_SetString(PyExc_RuntimeError, cdb_get_error());
+        goto done;
+    }
+    
+    Py_INCREF(Py_None);
+    result = Py_None;
+
+done:
+    PyMem_Free(names);
+    PyMem_Free(types);
+    Py_DECREF(seq);
+    return result;
+}
+
 /* Insert int32 method */
 static PyObject* PyColumnDB_insert_int32(PyColumnDBObject* self, PyObject* args) {
+    ENSURE_IDLE(self);
+    
     const char* column_name;
     int32_t value;
     
@@ -74,6 +176,8 @@ static PyObject* PyColumnDB_insert_int32(PyColumnDBObject* self, PyObject* args)
 
 /* Insert int64 method */
 static PyObject* PyColumnDB_insert_int64(PyColumnDBObject* self, PyObject* args) {
+    ENSURE_IDLE(self);
+    
     const char* column_name;
     int64_t value;
     
@@ -91,6 +195,8 @@ static PyObject* PyColumnDB_insert_int64(PyColumnDBObject* self, PyObject* args)
 
 /* Insert float32 method */
 static PyObject* PyColumnDB_insert_float32(PyColumnDBObject* self, PyObject* args) {
+    ENSURE_IDLE(self);
+    
     const char* column_name;
     float value;
     
@@ -108,6 +214,8 @@ static PyObject* PyColumnDB_insert_float32(PyColumnDBObject* self, PyObject* arg
 
 /* Insert float64 method */
 static PyObject* PyColumnDB_insert_float64(PyColumnDBObject* self, PyObject* args) {
+    ENSURE_IDLE(self);
+    
     const char* column_name;
     double value;
     
@@ -125,6 +233,8 @@ static PyObject* PyColumnDB_insert_float64(PyColumnDBObject* self, PyObject* arg
 
 /* Insert string method */
 static PyObject* PyColumnDB_insert_string(PyColumnDBObject* self, PyObject* args) {
+    ENSURE_IDLE(self);
+    
     const char* column_name;
     const char* value;
     
@@ -142,6 +252,8 @@ static PyObject* PyColumnDB_insert_string(PyColumnDBObject* self, PyObject* args
 
 /* Insert bool method */
 static PyObject* PyColumnDB_insert_bool(PyColumnDBObject* self, PyObject* args) {
+    ENSURE_IDLE(self);
+    
     const char* column_name;
     int value;
     
@@ -159,6 +271,8 @@ static PyObject* PyColumnDB_insert_bool(PyColumnDBObject* self, PyObject* args)
 
 /* Insert NULL method */
 static PyObject* PyColumnDB_insert_null(PyColumnDBObject* self, PyObject* args) {
+    ENSURE_IDLE(self);
+    
     const char* column_name;
     
     if (!PyArg_ParseTuple(args, "s", &column_name)) {
@@ -173,143 +287,1362 @@ static PyObject* PyColumnDB_insert_null(PyColumnDBObject* self, PyObject* args)
     Py_RETURN_NONE;
 }
 
-/* Get num rows method */
-static PyObject* PyColumnDB_get_num_rows(PyColumnDBObject* self, PyObject* Py_UNUSED(args)) {
-    return PyLong_FromSize_t(cdb_get_num_rows(self->db));
+/* Get a column's id for the *_by_id insert methods */
+static PyObject* PyColumnDB_get_column_id(PyColumnDBObject* self, PyObject* args) {
+    ENSURE_IDLE(self);
+    
+    const char* column_name;
+    
+    if (!PyArg_ParseTuple(args, "s", &column_name)) {
+        return NULL;
+    }
+    
+    int column_id = cdb_get_column_index(self->db, column_name);
+    if (column_id < 0) {
+        PyErr_SetString(PyExc_ValueError, cdb_get_error());
+        return NULL;
+    }
+    
+    return PyLong_FromLong(column_id);
 }
 
-/* Get num columns method */
-static PyObject* PyColumnDB_get_num_columns(PyColumnDBObject* self, PyObject* Py_UNUSED(args)) {
-    return PyLong_FromSize_t(cdb_get_num_columns(self->db));
+/* Insert int32 by column id method */
+static PyObject* PyColumnDB_insert_int32_by_id(PyColumnDBObject* self, PyObject* args) {
+    ENSURE_IDLE(self);
+    
+    int column_id;
+    int32_t value;
+    
+    if (!PyArg_ParseTuple(args, "ii", &column_id, &value)) {
+        return NULL;
+    }
+    
+    if (cdb_insert_int32_by_id(self->db, column_id, value) < 0) {
+        PyErr_SetString(PyExc_RuntimeError, cdb_get_error());
+        return NULL;
+    }
+    
+    Py_RETURN_NONE;
 }
 
-/* Get column data method */
-static PyObject* PyColumnDB_get_column_data(PyColumnDBObject* self, PyObject* args) {
-    const char* column_name;
+/* Insert int64 by column id method */
+static PyObject* PyColumnDB_insert_int64_by_id(PyColumnDBObject* self, PyObject* args) {
+    ENSURE_IDLE(self);
     
-    if (!PyArg_ParseTuple(args, "s", &column_name)) {
+    int column_id;
+    int64_t value;
+    
+    if (!PyArg_ParseTuple(args, "iL", &column_id, &value)) {
         return NULL;
     }
     
-    cdb_column_t* col = cdb_get_column(self->db, column_name);
-    if (!col) {
-        PyErr_SetString(PyExc_ValueError, cdb_get_error());
+    if (cdb_insert_int64_by_id(self->db, column_id, value) < 0) {
+        PyErr_SetString(PyExc_RuntimeError, cdb_get_error());
         return NULL;
     }
     
-    /* Build a list of values */
-    PyObject* result = PyList_New(col->num_rows);
-    if (!result) {
+    Py_RETURN_NONE;
+}
+
+/* Insert float32 by column id method */
+static PyObject* PyColumnDB_insert_float32_by_id(PyColumnDBObject* self, PyObject* args) {
+    ENSURE_IDLE(self);
+    
+    int column_id;
+    float value;
+    
+    if (!PyArg_ParseTuple(args, "if", &column_id, &value)) {
         return NULL;
     }
     
-    for (size_t i = 0; i < col->num_rows; i++) {
-        PyObject* value;
-        
-        if (cdb_is_null(col, i)) {
-            value = Py_None;
-            Py_INCREF(Py_None);
-        } else {
-            switch (col->data_type) {
-                case CDB_TYPE_INT32:
-                    value = PyLong_FromLong(cdb_get_int32(col, i));
-                    break;
-                case CDB_TYPE_INT64:
-                    value = PyLong_FromLongLong(cdb_get_int64(col, i));
-                    break;
-                case CDB_TYPE_FLOAT32:
-                    value = PyFloat_FromDouble(cdb_get_float32(col, i));
-                    break;
-                case CDB_TYPE_FLOAT64:
-                    value = PyFloat_FromDouble(cdb_get_float64(col, i));
-                    break;
-                case CDB_TYPE_STRING:
-                    value = PyUnicode_FromString(cdb_get_string(col, i));
-                    break;
-                case CDB_TYPE_BOOL:
-                    value = PyBool_FromLong(cdb_get_bool(col, i));
-                    break;
-                default:
-                    value = Py_None;
-                    Py_INCREF(Py_None);
-            }
-        }
-        
-        if (!value) {
-            Py_DECREF(result);
-            return NULL;
-        }
-        
-        PyList_SET_ITEM(result, i, value);
+    if (cdb_insert_float32_by_id(self->db, column_id, value) < 0) {
+        PyErr_SetString(PyExc_RuntimeError, cdb_get_error());
+        return NULL;
     }
     
-    return result;
+    Py_RETURN_NONE;
 }
 
-/* Get column names */
-static PyObject* PyColumnDB_get_column_names(PyColumnDBObject* self, PyObject* args)
-{
-    size_t num_cols = self->db->num_columns;
-    PyObject* result = PyList_New(num_cols);
-    if (!result) {
+/* Insert float64 by column id method */
+static PyObject* PyColumnDB_insert_float64_by_id(PyColumnDBObject* self, PyObject* args) {
+    ENSURE_IDLE(self);
+    
+    int column_id;
+    double value;
+    
+    if (!PyArg_ParseTuple(args, "id", &column_id, &value)) {
         return NULL;
     }
     
-    for (size_t i = 0; i < num_cols; i++) {
-        const char* name = cdb_get_column_name(self->db, i);
-        if (!name) {
-            name = "";
-        }
-        
-        PyObject* name_obj = PyUnicode_FromString(name);
-        if (!name_obj) {
-            Py_DECREF(result);
-            return NULL;
-        }
-        
-        PyList_SET_ITEM(result, i, name_obj);
+    if (cdb_insert_float64_by_id(self->db, column_id, value) < 0) {
+        PyErr_SetString(PyExc_RuntimeError, cdb_get_error());
+        return NULL;
     }
     
-    return result;
+    Py_RETURN_NONE;
 }
 
-/* Save database to file */
-static PyObject* PyColumnDB_save(PyColumnDBObject* self, PyObject* args)
-{
-    const char* filename;
-    if (!PyArg_ParseTuple(args, "s", &filename)) {
+/* Insert string by column id method */
+static PyObject* PyColumnDB_insert_string_by_id(PyColumnDBObject* self, PyObject* args) {
+    ENSURE_IDLE(self);
+    
+    int column_id;
+    const char* value;
+    
+    if (!PyArg_ParseTuple(args, "is", &column_id, &value)) {
         return NULL;
     }
     
-    int result = cdb_save(filename, self->db);
-    if (result != 0) {
-        PyErr_SetString(PyExc_IOError, "Failed to save database");
+    if (cdb_insert_string_by_id(self->db, column_id, value) < 0) {
+        PyErr_SetString(PyExc_RuntimeError, cdb_get_error());
         return NULL;
     }
     
     Py_RETURN_NONE;
 }
 
-/* Load database from file - instance method */
-static PyObject* PyColumnDB_load(PyColumnDBObject* self, PyObject* args)
-{
-    const char* filename;
-    if (!PyArg_ParseTuple(args, "s", &filename)) {
+/* Insert bool by column id method */
+static PyObject* PyColumnDB_insert_bool_by_id(PyColumnDBObject* self, PyObject* args) {
+    ENSURE_IDLE(self);
+    
+    int column_id;
+    int value;
+    
+    if (!PyArg_ParseTuple(args, "ip", &column_id, &value)) {
         return NULL;
     }
     
-    int result = cdb_open(filename, self->db);
-    if (result != 0) {
-        PyErr_SetString(PyExc_IOError, "Failed to load database");
+    if (cdb_insert_bool_by_id(self->db, column_id, (uint8_t)value) < 0) {
+        PyErr_SetString(PyExc_RuntimeError, cdb_get_error());
+        return NULL;
+    }
+    
+    Py_RETURN_NONE;
+}
+
+/* Insert NULL by column id method */
+static PyObject* PyColumnDB_insert_null_by_id(PyColumnDBObject* self, PyObject* args) {
+    ENSURE_IDLE(self);
+    
+    int column_id;
+    
+    if (!PyArg_ParseTuple(args, "i", &column_id)) {
+        return NULL;
+    }
+    
+    if (cdb_insert_null_by_id(self->db, column_id) < 0) {
+        PyErr_SetString(PyExc_RuntimeError, cdb_get_error());
         return NULL;
     }
     
     Py_RETURN_NONE;
 }
 
+/* Convert a Python object to int64 the way int() would */
+static int as_int64(PyObject* obj, int64_t* out) {
+    PyObject* num;
+    if (PyLong_Check(obj)) {
+        Py_INCREF(obj);
+        num = obj;
+    } else {
+        num = PyNumber_Long(obj);
+        if (!num) return -1;
+    }
+    
+    long long value = PyLong_AsLongLong(num);
+    Py_DECREF(num);
+    if (value == -1 && PyErr_Occurred()) {
+        return -1;
+    }
+    *out = (int64_t)value;
+    return 0;
+}
+
+/* Convert a Python object to double the way float() would */
+static int as_double(PyObject* obj, double* out) {
+    if (PyFloat_Check(obj)) {
+        *out = PyFloat_AS_DOUBLE(obj);
+        return 0;
+    }
+    
+    PyObject* num = PyNumber_Float(obj);
+    if (!num) return -1;
+    *out = PyFloat_AS_DOUBLE(num);
+    Py_DECREF(num);
+    return 0;
+}
+
+/* Get the UTF-8 text of a Python object the way str() would; *owner must be released */
+static const char* as_utf8(PyObject* obj, PyObject** owner) {
+    PyObject* text;
+    if (PyUnicode_Check(obj)) {
+        Py_INCREF(obj);
+        text = obj;
+    } else {
+        text = PyObject_Str(obj);
+        if (!text) return NULL;
+    }
+    
+    Py_ssize_t size;
+    const char* utf8 = PyUnicode_AsUTF8AndSize(text, &size);
+    if (!utf8) {
+        Py_DECREF(text);
+        return NULL;
+    }
+    if (strlen(utf8) != (size_t)size) {
+        Py_DECREF(text);
+        PyErr_SetString(PyExc_ValueError, "embedded null character");
+        return NULL;
+    }
+    
+    *owner = text;
+    return utf8;
+}
+
+/* Copy a Python object into a new C string the way str() would */
+static char* as_string(PyObject* obj) {
+    PyObject* owner;
+    const char* utf8 = as_utf8(obj, &owner);
+    if (!utf8) return NULL;
+    
+    size_t len = strlen(utf8) + 1;
+    char* copy = (char*)malloc(len);
+    if (!copy) {
+        Py_DECREF(owner);
+        PyErr_NoMemory();
+        return NULL;
+    }
+    memcpy(copy, utf8, len);
+    Py_DECREF(owner);
+    return copy;
+}
+
+/* Find the target column of a bulk insert; STRING input also fills STRING_DICT columns */
+static cdb_column_t* bulk_insert_column(PyColumnDBObject* self, const char* column_name, cdb_data_type_t* type) {
+    cdb_column_t* col = cdb_get_column(self->db, column_name);
+    if (col && *type == CDB_TYPE_STRING && col->data_type == CDB_TYPE_STRING_DICT) {
+        *type = CDB_TYPE_STRING_DICT;
+    }
+    if (!col || col->data_type != *type) {
+        PyErr_SetString(PyExc_RuntimeError, "Column not found or type mismatch");
+        return NULL;
+    }
+    return col;
+}
+
+/*
+ * Append a sequence of values to a column of the given type in one call.
+ *
+ * Converting a value can call back into Python (__index__, __float__,
+ * __str__), and that code may use this database or the sequence itself.
+ * So every value is first converted into a staging buffer, and the column
+ * is only looked up again and written once no more Python code can run.
+ */
+static PyObject* insert_many_typed(PyColumnDBObject* self, PyObject* args, cdb_data_type_t type) {
+    const char* column_name;
+    PyObject* values;
+    
+    if (!PyArg_ParseTuple(args, "sO", &column_name, &values)) {
+        return NULL;
+    }
+    
+    /* Fail early on a bad column; the pointer isn't kept across conversions */
+    if (!bulk_insert_column(self, column_name, &type)) {
+        return NULL;
+    }
+    
+    PyObject* seq = PySequence_Fast(values, "values must be a sequence");
+    if (seq && PyList_Check(seq)) {
+        /* Snapshot a list so a callback can't resize it under the loop */
+        PyObject* items = PyList_AsTuple(seq);
+        Py_DECREF(seq);
+        seq = items;
+    }
+    if (!seq) {
+        return NULL;
+    }
+    
+    Py_ssize_t n = PySequence_Fast_GET_SIZE(seq);
+    PyObject** items = PySequence_Fast_ITEMS(seq);
+    int is_text = type == CDB_TYPE_STRING || type == CDB_TYPE_STRING_DICT;
+    size_t width = is_text ? sizeof(char*) : cdb_type_size(type);
+    /* Zeroed, so NULL rows stage a zero value (or a NULL string) */
+    void* staged = PyMem_Calloc(n ? (size_t)n : 1, width);
+    uint8_t* nulls = PyMem_Calloc(n ? (size_t)n : 1, 1);
+    char** strings = (char**)staged;
+    Py_ssize_t num_strings = 0;  /* Staged strings still owned here */
+    PyObject* result = NULL;
+    
+    if (!staged || !nulls) {
+        PyErr_NoMemory();
+        goto done;
+    }
+    
+    for (Py_ssize_t i = 0; i < n; i++) {
+        PyObject* item = items[i];
+        
+        if (item == Py_None) {
+            nulls[i] = 1;
+            continue;
+        }
+        
+        switch (type) {
+            case CDB_TYPE_INT32: {
+                int64_t value;
+                if (as_int64(item, &value) < 0) goto done;
+                if (value < INT32_MIN || value > INT32_MAX) {
+                    PyErr_SetString(PyExc_OverflowError, "value out of range for int32");
+                    goto done;
+                }
+                ((int32_t*)staged)[i] = (int32_t)value;
+                break;
+            }
+            case CDB_TYPE_INT64:
+                if (as_int64(item, &((int64_t*)staged)[i]) < 0) goto done;
+                break;
+            case CDB_TYPE_FLOAT32: {
+                double value;
+                if (as_double(item, &value) < 0) goto done;
+                ((float*)staged)[i] = (float)value;
+                break;
+            }
+            case CDB_TYPE_FLOAT64:
+                if (as_double(item, &((double*)staged)[i]) < 0) goto done;
+                break;
+            case CDB_TYPE_STRING:
+            case CDB_TYPE_STRING_DICT:
+                strings[i] = as_string(item);
+                if (!strings[i]) goto done;
+                num_strings = i + 1;
+                break;
+            case CDB_TYPE_BOOL: {
+                int value = PyObject_IsTrue(item);
+                if (value < 0) goto done;
+                ((uint8_t*)staged)[i] = (uint8_t)value;
+                break;
+            }
+            default:
+                PyErr_SetString(PyExc_ValueError, "Invalid data type");
+                goto done;
+        }
+    }
+    
+    /* A callback may have let another thread start a save; wait for it */
+    ENSURE_IDLE(self);
+    cdb_column_t* col = bulk_insert_column(self, column_name, &type);
+    if (!col) {
+        goto done;
+    }
+    
+    size_t start = col->num_rows;
+    if (cdb_column_ensure_capacity(col, start + (size_t)n) < 0) {
+        PyErr_SetString(PyExc_RuntimeError, cdb_get_error());
+        goto done;
+    }
+    
+    switch (type) {
+        case CDB_TYPE_STRING_DICT:
+            for (Py_ssize_t i = 0; i < n; i++) {
+                uint32_t* code = &((uint32_t*)col->data)[start + (size_t)i];
+                *code = 0;
+                if (strings[i] && cdb_string_dict_encode(col, strings[i], code) < 0) {
+                    PyErr_SetString(PyExc_RuntimeError, cdb_get_error());
+                    goto done;
+                }
+            }
+            break;
+        case CDB_TYPE_BOOL:
+            cdb_bool_pack(col, start, (const uint8_t*)staged, (size_t)n);
+            break;
+        default:
+            /* The column takes ownership of staged strings */
+            memcpy((char*)col->data + start * width, staged, (size_t)n * width);
+            if (type == CDB_TYPE_STRING) {
+                num_strings = 0;
+            }
+            break;
+    }
+    for (Py_ssize_t i = 0; i < n; i++) {
+        if (nulls[i]) {
+            cdb_column_set_null(col, start + (size_t)i);
+        }
+    }
+    col->num_rows = start + (size_t)n;
+    
+    Py_INCREF(Py_None);
+    result = Py_None;
+
+done:
+    for (Py_ssize_t i = 0; i < num_strings; i++) {
+        free(strings[i]);
+    }
+    PyMem_Free(staged);
+    PyMem_Free(nulls);
+    Py_DECREF(seq);
+    return result;
+}
+
+/* Bulk insert methods */
+static PyObject* PyColumnDB_insert_many_int32(PyColumnDBObject* self, PyObject* args) {
+    ENSURE_IDLE(self);
+    
+    return insert_many_typed(self, args, CDB_TYPE_INT32);
+}
+
+static PyObject* PyColumnDB_insert_many_int64(PyColumnDBObject* self, PyObject* args) {
+    ENSURE_IDLE(self);
+    
+    return insert_many_typed(self, args, CDB_TYPE_INT64);
+}
+
+static PyObject* PyColumnDB_insert_many_float32(PyColumnDBObject* self, PyObject* args) {
+    ENSURE_IDLE(self);
+    
+    return insert_many_typed(self, args, CDB_TYPE_FLOAT32);
+}
+
+static PyObject* PyColumnDB_insert_many_float64(PyColumnDBObject* self, PyObject* args) {
+    ENSURE_IDLE(self);
+    
+    return insert_many_typed(self, args, CDB_TYPE_FLOAT64);
+}
+
+static PyObject* PyColumnDB_insert_many_string(PyColumnDBObject* self, PyObject* args) {
+    ENSURE_IDLE(self);
+    
+    return insert_many_typed(self, args, CDB_TYPE_STRING);
+}
+
+static PyObject* PyColumnDB_insert_many_bool(PyColumnDBObject* self, PyObject* args) {
+    ENSURE_IDLE(self);
+    
+    return insert_many_typed(self, args, CDB_TYPE_BOOL);
+}
+
+/* Append the raw contents of a buffer (e.g. a NumPy array) to a numeric column */
+static PyObject* PyColumnDB_insert_buffer(PyColumnDBObject* self, PyObject* args) {
+    ENSURE_IDLE(self);
+    
+    const char* column_name;
+    int type;
+    PyObject* obj;
+    
+    if (!PyArg_ParseTuple(args, "siO", &column_name, &type, &obj)) {
+        return NULL;
+    }
+    
+    /* Fail early on a bad column; the pointer isn't kept, see below */
+    cdb_column_t* col = cdb_get_column(self->db, column_name);
+    if (!col || (int)col->data_type != type) {
+        PyErr_SetString(PyExc_RuntimeError, "Column not found or type mismatch");
+        return NULL;
+    }
+    if (type == CDB_TYPE_STRING || type == CDB_TYPE_STRING_DICT) {
+        PyErr_SetString(PyExc_TypeError, "insert_buffer does not support string columns");
+        return NULL;
+    }
+    
+    Py_buffer buf;
+    if (PyObject_GetBuffer(obj, &buf, PyBUF_C_CONTIGUOUS) < 0) {
+        return NULL;
+    }
+    
+    size_t itemsize = cdb_type_size((cdb_data_type_t)type);
+    if (buf.len % (Py_ssize_t)itemsize != 0) {
+        PyBuffer_Release(&buf);
+        PyErr_SetString(PyExc_ValueError, "buffer size is not a multiple of the column item size");
+        return NULL;
+    }
+    
+    /*
+     * Getting the buffer can run Python code and waiting for the lock lets
+     * other threads run, either of which may add columns and move the
+     * column table, so look the column up again once db is ours
+     */
+    size_t n = (size_t)buf.len / itemsize;
+    PyThreadState* state = NULL;
+    if (buf.len >= NOGIL_MIN_BYTES) {
+        state = release_gil(self);
+    } else {
+        ENSURE_IDLE(self);
+    }
+    col = cdb_get_column(self->db, column_name);
+    int found = col && (int)col->data_type == type;
+    int rc = found ? cdb_column_ensure_capacity(col, col->num_rows + n) : -1;
+    if (rc == 0) {
+        if (col->data_type == CDB_TYPE_BOOL) {
+            cdb_bool_pack(col, col->num_rows, (const uint8_t*)buf.buf, n);
+        } else {
+            memcpy((char*)col->data + col->num_rows * itemsize, buf.buf, (size_t)buf.len);
+        }
+        col->num_rows += n;
+    }
+    if (state) reacquire_gil(self, state);
+    
+    PyBuffer_Release(&buf);
+    if (!found) {
+        PyErr_SetString(PyExc_RuntimeError, "Column not found or type mismatch");
+        return NULL;
+    }
+    if (rc < 0) {
+        PyErr_SetString(PyExc_RuntimeError, cdb_get_error());
+        return NULL;
+    }
+    Py_RETURN_NONE;
+}
+
+/* Reserve capacity for num_rows rows in one column or all columns */
+static PyObject* PyColumnDB_reserve(PyColumnDBObject* self, PyObject* args) {
+    ENSURE_IDLE(self);
+    
+    Py_ssize_t num_rows;
+    const char* column_name = NULL;
+    
+    if (!PyArg_ParseTuple(args, "n|z", &num_rows, &column_name)) {
+        return NULL;
+    }
+    
+    if (num_rows < 0) {
+        PyErr_SetString(PyExc_ValueError, "num_rows must be non-negative");
+        return NULL;
+    }
+    
+    int result;
+    if (column_name) {
+        cdb_column_t* col = cdb_get_column(self->db, column_name);
+        if (!col) {
+            PyErr_SetString(PyExc_RuntimeError, cdb_get_error());
+            return NULL;
+        }
+        result = cdb_column_reserve(col, (size_t)num_rows);
+    } else {
+        result = cdb_reserve(self->db, (size_t)num_rows);
+    }
+    
+    if (result < 0) {
+        PyErr_SetString(PyExc_RuntimeError, cdb_get_error());
+        return NULL;
+    }
+    
+    Py_RETURN_NONE;
+}
+
+/* Get num rows method */
+static PyObject* PyColumnDB_get_num_rows(PyColumnDBObject* self, PyObject* Py_UNUSED(args)) {
+    ENSURE_IDLE(self);
+    return PyLong_FromSize_t(cdb_get_num_rows(self->db));
+}
+
+/* Get num columns method */
+static PyObject* PyColumnDB_get_num_columns(PyColumnDBObject* self, PyObject* Py_UNUSED(args)) {
+    ENSURE_IDLE(self);
+    return PyLong_FromSize_t(cdb_get_num_columns(self->db));
+}
+
+/* Build the list of unique strings of a STRING_DICT column, indexed by code */
+static PyObject* dict_categories(cdb_column_t* col) {
+    PyObject* result = PyList_New(col->dict->size);
+    if (!result) {
+        return NULL;
+    }
+    
+    for (uint32_t code = 0; code < col->dict->size; code++) {
+        PyObject* value = PyUnicode_FromString(col->dict->values[code]);
+        if (!value) {
+            Py_DECREF(result);
+            return NULL;
+        }
+        PyList_SET_ITEM(result, code, value);
+    }
+    
+    return result;
+}
+
+/* Build a list for a STRING_DICT column, sharing one str object per unique value */
+static PyObject* dict_column_to_list(cdb_column_t* col) {
+    PyObject* categories = dict_categories(col);
+    if (!categories) {
+        return NULL;
+    }
+    
+    PyObject* result = PyList_New(col->num_rows);
+    if (!result) {
+        Py_DECREF(categories);
+        return NULL;
+    }
+    
+    const uint32_t* codes = (const uint32_t*)col->data;
+    for (size_t start = 0; start < col->num_rows; start += 64) {
+        size_t end = start + 64 < col->num_rows ? start + 64 : col->num_rows;
+        int has_nulls = col->has_any_null && cdb_null_word(col, start / 64) != 0;
+        
+        for (size_t i = start; i < end; i++) {
+            PyObject* value = has_nulls && cdb_is_null(col, i) ? Py_None : PyList_GET_ITEM(categories, codes[i]);
+            Py_INCREF(value);
+            PyList_SET_ITEM(result, i, value);
+        }
+    }
+    
+    Py_DECREF(categories);
+    return result;
+}
+
+/*
+ * Fill a preallocated list from a column's typed buffer. box is evaluated
+ * for every non-NULL row with values and i in scope. The NULL bitmap is
+ * walked 64 rows at a time: blocks without NULLs skip the per-row check,
+ * and columns that never held a NULL skip the bitmap entirely.
+ */
+#define FILL_LIST(ctype, box) \
+    do { \
+        const ctype* values = (const ctype*)col->data; \
+        for (size_t start = 0; start < col->num_rows; start += 64) { \
+            size_t end = start + 64 < col->num_rows ? start + 64 : col->num_rows; \
+            int has_nulls = col->has_any_null && cdb_null_word(col, start / 64) != 0; \
+            for (size_t i = start; i < end; i++) { \
+                PyObject* value; \
+                if (has_nulls && cdb_is_null(col, i)) { \
+                    value = Py_None; \
+                    Py_INCREF(Py_None); \
+                } else if (!(value = (box))) { \
+                    Py_DECREF(result); \
+                    return NULL; \
+                } \
+                PyList_SET_ITEM(result, i, value); \
+            } \
+        } \
+    } while (0)
+
+/* Build a list of Python values for a column (None for NULLs) */
+static PyObject* column_to_list(cdb_column_t* col) {
+    if (col->data_type == CDB_TYPE_STRING_DICT) {
+        return dict_column_to_list(col);
+    }
+    
+    /* Build a list of values, dispatching on the type once rather than per row */
+    PyObject* result = PyList_New(col->num_rows);
+    if (!result) {
+        return NULL;
+    }
+    
+    switch (col->data_type) {
+        case CDB_TYPE_INT32:
+            FILL_LIST(int32_t, PyLong_FromLong(values[i]));
+            break;
+        case CDB_TYPE_INT64:
+            FILL_LIST(int64_t, PyLong_FromLongLong(values[i]));
+            break;
+        case CDB_TYPE_FLOAT32:
+            FILL_LIST(float, PyFloat_FromDouble(values[i]));
+            break;
+        case CDB_TYPE_FLOAT64:
+            FILL_LIST(double, PyFloat_FromDouble(values[i]));
+            break;
+        case CDB_TYPE_STRING:
+            FILL_LIST(char*, PyUnicode_FromString(values[i]));
+            break;
+        case CDB_TYPE_BOOL:
+            FILL_LIST(uint64_t, PyBool_FromLong((long)((values[i >> 6] >> (i & 63)) & 1)));
+            break;
+        default:
+            Py_DECREF(result);
+            PyErr_SetString(PyExc_ValueError, "Invalid data type");
+            return NULL;
+    }
+    
+    return result;
+}
+
+#undef FILL_LIST
+
+/* Get column data method */
+static PyObject* PyColumnDB_get_column_data(PyColumnDBObject* self, PyObject* args) {
+    ENSURE_IDLE(self);
+    
+    const char* column_name;
+    
+    if (!PyArg_ParseTuple(args, "s", &column_name)) {
+        return NULL;
+    }
+    
+    cdb_column_t* col = cdb_get_column(self->db, column_name);
+    if (!col) {
+        PyErr_SetString(PyExc_ValueError, cdb_get_error());
+        return NULL;
+    }
+    
+    return column_to_list(col);
+}
+
+/* Get the number of rows stored in one column */
+static PyObject* PyColumnDB_get_column_length(PyColumnDBObject* self, PyObject* args) {
+    ENSURE_IDLE(self);
+    
+    const char* column_name;
+    
+    if (!PyArg_ParseTuple(args, "s", &column_name)) {
+        return NULL;
+    }
+    
+    cdb_column_t* col = cdb_get_column(self->db, column_name);
+    if (!col) {
+        PyErr_SetString(PyExc_ValueError, cdb_get_error());
+        return NULL;
+    }
+    
+    return PyLong_FromSize_t(col->num_rows);
+}
+
+/* Struct format character for the memoryview of each fixed-width type */
+static const char* buffer_format(cdb_data_type_t type) {
+    switch (type) {
+        case CDB_TYPE_INT32: return "i";
+        case CDB_TYPE_INT64: return "q";
+        case CDB_TYPE_FLOAT32: return "f";
+        case CDB_TYPE_FLOAT64: return "d";
+        case CDB_TYPE_BOOL: return "?";
+        default: return NULL;
+    }
+}
+
+/*
+ * Build a typed memoryview over a snapshot of a numeric column. The view is
+ * read-only (backed by bytes) unless writable is set, in which case it is
+ * backed by a bytearray the caller owns outright.
+ */
+static PyObject* column_to_buffer(PyColumnDBObject* self, cdb_column_t* col, int writable) {
+    const char* format = buffer_format(col->data_type);
+    if (!format) {
+        PyErr_SetString(PyExc_TypeError, "Column buffers are only available for numeric and bool columns");
+        return NULL;
+    }
+    
+    /* One memcpy of the raw column storage; no per-value boxing */
+    size_t size = col->num_rows * cdb_type_size(col->data_type);
+    PyObject* raw = writable ? PyByteArray_FromStringAndSize(NULL, (Py_ssize_t)size)
+                             : PyBytes_FromStringAndSize(NULL, (Py_ssize_t)size);
+    if (!raw) {
+        return NULL;
+    }
+    char* dest = writable ? PyByteArray_AS_STRING(raw) : PyBytes_AS_STRING(raw);
+    PyThreadState* state = size >= NOGIL_MIN_BYTES ? release_gil(self) : NULL;
+    if (col->data_type == CDB_TYPE_BOOL) {
+        /* Bit-packed in storage; callers get one byte per value */
+        cdb_bool_unpack(col, (uint8_t*)dest);
+    } else {
+        memcpy(dest, col->data, size);
+    }
+    if (state) reacquire_gil(self, state);
+    
+    PyObject* bytes_view = PyMemoryView_FromObject(raw);
+    Py_DECREF(raw);
+    if (!bytes_view) {
+        return NULL;
+    }
+    
+    PyObject* result = PyObject_CallMethod(bytes_view, "cast", "s", format);
+    Py_DECREF(bytes_view);
+    return result;
+}
+
+/* Get a read-only typed memoryview over a snapshot of a numeric column */
+static PyObject* PyColumnDB_get_column_buffer(PyColumnDBObject* self, PyObject* args) {
+    ENSURE_IDLE(self);
+    
+    const char* column_name;
+    
+    if (!PyArg_ParseTuple(args, "s", &column_name)) {
+        return NULL;
+    }
+    
+    cdb_column_t* col = cdb_get_column(self->db, column_name);
+    if (!col) {
+        PyErr_SetString(PyExc_ValueError, cdb_get_error());
+        return NULL;
+    }
+    
+    return column_to_buffer(self, col, 0);
+}
+
+/* Copy a column's null bitmap into bytes, or return None if it has no NULLs */
+static PyObject* column_null_bitmap(cdb_column_t* col) {
+    if (!col->has_any_null) {
+        Py_RETURN_NONE;
+    }
+    
+    size_t num_words = (col->num_rows + 63) / 64;
+    for (size_t w = 0; w < num_words; w++) {
+        if (cdb_null_word(col, w)) {
+            size_t bitmap_size = (col->num_rows + 7) / 8;
+            return PyBytes_FromStringAndSize((const char*)col->null_bitmap, (Py_ssize_t)bitmap_size);
+        }
+    }
+    
+    Py_RETURN_NONE;
+}
+
+/* Count the NULL rows of a column */
+static PyObject* PyColumnDB_count_nulls(PyColumnDBObject* self, PyObject* args) {
+    ENSURE_IDLE(self);
+    
+    const char* column_name;
+    
+    if (!PyArg_ParseTuple(args, "s", &column_name)) {
+        return NULL;
+    }
+    
+    cdb_column_t* col = cdb_get_column(self->db, column_name);
+    if (!col) {
+        PyErr_SetString(PyExc_ValueError, cdb_get_error());
+        return NULL;
+    }
+    
+    return PyLong_FromSize_t(cdb_null_count(col));
+}
+
+/* Count the TRUE values of a BOOL column */
+static PyObject* PyColumnDB_count_true(PyColumnDBObject* self, PyObject* args) {
+    ENSURE_IDLE(self);
+    
+    const char* column_name;
+    
+    if (!PyArg_ParseTuple(args, "s", &column_name)) {
+        return NULL;
+    }
+    
+    cdb_column_t* col = cdb_get_column(self->db, column_name);
+    if (!col) {
+        PyErr_SetString(PyExc_ValueError, cdb_get_error());
+        return NULL;
+    }
+    if (col->data_type != CDB_TYPE_BOOL) {
+        PyErr_SetString(PyExc_TypeError, "Column is not a bool column");
+        return NULL;
+    }
+    
+    return PyLong_FromSize_t(cdb_count_true(col));
+}
+
+/* Get the null bitmap of a column as bytes, or None if it has no NULLs */
+static PyObject* PyColumnDB_get_null_bitmap(PyColumnDBObject* self, PyObject* args) {
+    ENSURE_IDLE(self);
+    
+    const char* column_name;
+    
+    if (!PyArg_ParseTuple(args, "s", &column_name)) {
+        return NULL;
+    }
+    
+    cdb_column_t* col = cdb_get_column(self->db, column_name);
+    if (!col) {
+        PyErr_SetString(PyExc_ValueError, cdb_get_error());
+        return NULL;
+    }
+    
+    return column_null_bitmap(col);
+}
+
+/* Get a STRING_DICT column as (uint32 codes memoryview, list of unique strings) */
+static PyObject* dict_column_codes(cdb_column_t* col) {
+    PyObject* raw = PyBytes_FromStringAndSize(
+        (const char*)col->data, (Py_ssize_t)(col->num_rows * sizeof(uint32_t)));
+    if (!raw) {
+        return NULL;
+    }
+    
+    PyObject* bytes_view = PyMemoryView_FromObject(raw);
+    Py_DECREF(raw);
+    if (!bytes_view) {
+        return NULL;
+    }
+    
+    PyObject* codes = PyObject_CallMethod(bytes_view, "cast", "s", "I");
+    Py_DECREF(bytes_view);
+    if (!codes) {
+        return NULL;
+    }
+    
+    PyObject* categories = dict_categories(col);
+    if (!categories) {
+        Py_DECREF(codes);
+        return NULL;
+    }
+    
+    PyObject* result = PyTuple_Pack(2, codes, categories);
+    Py_DECREF(codes);
+    Py_DECREF(categories);
+    return result;
+}
+
+/* Get the codes and unique strings of a dictionary-encoded column */
+static PyObject* PyColumnDB_get_dictionary(PyColumnDBObject* self, PyObject* args) {
+    ENSURE_IDLE(self);
+    
+    const char* column_name;
+    
+    if (!PyArg_ParseTuple(args, "s", &column_name)) {
+        return NULL;
+    }
+    
+    cdb_column_t* col = cdb_get_column(self->db, column_name);
+    if (!col) {
+        PyErr_SetString(PyExc_ValueError, cdb_get_error());
+        return NULL;
+    }
+    if (col->data_type != CDB_TYPE_STRING_DICT) {
+        PyErr_SetString(PyExc_TypeError, "Column is not dictionary-encoded");
+        return NULL;
+    }
+    
+    return dict_column_codes(col);
+}
+
+/*
+ * Get every column in one call.
+ *
+ * With as_buffer false, maps each name to a list of values. With as_buffer
+ * true, maps each name to a (data, null_bitmap) pair where data is a
+ * writable typed memoryview (a fresh copy the caller owns, so it can back
+ * NumPy arrays directly) for numeric/bool columns, a (codes, categories) pair for
+ * dictionary-encoded columns, or a list for strings, and null_bitmap is
+ * bytes, or None when the column has no NULLs.
+ */
+static PyObject* PyColumnDB_get_all_columns(PyColumnDBObject* self, PyObject* args) {
+    ENSURE_IDLE(self);
+    
+    int as_buffer = 0;
+    
+    if (!PyArg_ParseTuple(args, "|p", &as_buffer)) {
+        return NULL;
+    }
+    
+    PyObject* result = PyDict_New();
+    if (!result) {
+        return NULL;
+    }
+    
+    for (size_t i = 0; i < self->db->num_columns; i++) {
+        cdb_column_t* col = &self->db->columns[i];
+        PyObject* entry;
+        
+        if (!as_buffer) {
+            entry = column_to_list(col);
+        } else {
+            PyObject* data;
+            if (col->data_type == CDB_TYPE_STRING_DICT) {
+                data = dict_column_codes(col);
+            } else if (buffer_format(col->data_type)) {
+                data = column_to_buffer(self, col, 1);
+            } else {
+                data = column_to_list(col);
+            }
+            if (!data) {
+                Py_DECREF(result);
+                return NULL;
+            }
+            PyObject* nulls = column_null_bitmap(col);
+            if (!nulls) {
+                Py_DECREF(data);
+                Py_DECREF(result);
+                return NULL;
+            }
+            entry = PyTuple_Pack(2, data, nulls);
+            Py_DECREF(data);
+            Py_DECREF(nulls);
+        }
+        
+        if (!entry || PyDict_SetItemString(result, col->name, entry) < 0) {
+            Py_XDECREF(entry);
+            Py_DECREF(result);
+            return NULL;
+        }
+        Py_DECREF(entry);
+    }
+    
+    return result;
+}
+
+/* Get column names */
+static PyObject* PyColumnDB_get_column_names(PyColumnDBObject* self, PyObject* args)
+{
+    ENSURE_IDLE(self);
+    
+    size_t num_cols = self->db->num_columns;
+    PyObject* result = PyList_New(num_cols);
+    if (!result) {
+        return NULL;
+    }
+    
+    for (size_t i = 0; i < num_cols; i++) {
+        const char* name = cdb_get_column_name(self->db, i);
+        if (!name) {
+            name = "";
+        }
+        
+        PyObject* name_obj = PyUnicode_FromString(name);
+        if (!name_obj) {
+            Py_DECREF(result);
+            return NULL;
+        }
+        
+        PyList_SET_ITEM(result, i, name_obj);
+    }
+    
+    return result;
+}
+
+/* Get column data types, in column order */
+static PyObject* PyColumnDB_get_column_types(PyColumnDBObject* self, PyObject* Py_UNUSED(args))
+{
+    ENSURE_IDLE(self);
+    
+    size_t num_cols = self->db->num_columns;
+    PyObject* result = PyList_New(num_cols);
+    if (!result) {
+        return NULL;
+    }
+    
+    for (size_t i = 0; i < num_cols; i++) {
+        PyObject* type_obj = PyLong_FromLong((long)cdb_get_column_type(self->db, i));
+        if (!type_obj) {
+            Py_DECREF(result);
+            return NULL;
+        }
+        
+        PyList_SET_ITEM(result, i, type_obj);
+    }
+    
+    return result;
+}
+
+/* Save database to file */
+static PyObject* PyColumnDB_save(PyColumnDBObject* self, PyObject* args)
+{
+    ENSURE_IDLE(self);
+    
+    const char* filename;
+    if (!PyArg_ParseTuple(args, "s", &filename)) {
+        return NULL;
+    }
+    
+    /* Pure file I/O: let other threads run meanwhile */
+    PyThreadState* state = release_gil(self);
+    int result = cdb_save(filename, self->db);
+    reacquire_gil(self, state);
+    if (result != 0) {
+        PyErr_Format(PyExc_IOError, "Failed to save database: %s", cdb_get_error());
+        return NULL;
+    }
+    
+    Py_RETURN_NONE;
+}
+
+/* Load database from file - instance method */
+static PyObject* PyColumnDB_load(PyColumnDBObject* self, PyObject* args)
+{
+    ENSURE_IDLE(self);
+    
+    const char* filename;
+    if (!PyArg_ParseTuple(args, "s", &filename)) {
+        return NULL;
+    }
+    
+    PyThreadState* state = release_gil(self);
+    errno = 0;
+    int result = cdb_open(filename, self->db);
+    int load_errno = errno;
+    reacquire_gil(self, state);
+    if (result != 0) {
+        if (load_errno == ENOENT) {
+            /* Raises FileNotFoundError so callers can skip a separate existence check */
+            errno = load_errno;
+            PyErr_SetFromErrnoWithFilename(PyExc_OSError, filename);
+            return NULL;
+        }
+        PyErr_Format(PyExc_IOError, "Failed to load database: %s", cdb_get_error());
+        return NULL;
+    }
+    
+    Py_RETURN_NONE;
+}
+
+/*
+ * Arrow C Data Interface export
+ *
+ * Structures as specified by https://arrow.apache.org/docs/format/CDataInterface.html
+ */
+#ifndef ARROW_C_DATA_INTERFACE
+#define ARROW_C_DATA_INTERFACE
+
+#define ARROW_FLAG_DICTIONARY_ORDERED 1
+#define ARROW_FLAG_NULLABLE 2
+#define ARROW_FLAG_MAP_KEYS_SORTED 4
+
+struct ArrowSchema {
+    const char* format;
+    const char* name;
+    const char* metadata;
+    int64_t flags;
+    int64_t n_children;
+    struct ArrowSchema** children;
+    struct ArrowSchema* dictionary;
+    void (*release)(struct ArrowSchema*);
+    void* private_data;
+};
+
+struct ArrowArray {
+    int64_t length;
+    int64_t null_count;
+    int64_t offset;
+    int64_t n_buffers;
+    int64_t n_children;
+    const void** buffers;
+    struct ArrowArray** children;
+    struct ArrowArray* dictionary;
+    void (*release)(struct ArrowArray*);
+    void* private_data;
+};
+
+#endif /* ARROW_C_DATA_INTERFACE */
+
+/* Buffers owned by an exported array (validity, offsets/data, string data) */
+typedef struct {
+    void* buffers[3];
+} arrow_array_private_t;
+
+static void release_arrow_array(struct ArrowArray* array) {
+    arrow_array_private_t* priv = (arrow_array_private_t*)array->private_data;
+    for (int i = 0; i < 3; i++) {
+        free(priv->buffers[i]);
+    }
+    free(priv);
+    if (array->dictionary) {
+        if (array->dictionary->release) array->dictionary->release(array->dictionary);
+        free(array->dictionary);
+    }
+    array->release = NULL;
+}
+
+static void release_arrow_schema(struct ArrowSchema* schema) {
+    free((void*)schema->name);
+    if (schema->dictionary) {
+        if (schema->dictionary->release) schema->dictionary->release(schema->dictionary);
+        free(schema->dictionary);
+    }
+    schema->release = NULL;
+}
+
+/* Arrow format string for a column's values */
+static const char* arrow_format(cdb_data_type_t type) {
+    switch (type) {
+        case CDB_TYPE_INT32: return "i";
+        case CDB_TYPE_INT64: return "l";
+        case CDB_TYPE_FLOAT32: return "f";
+        case CDB_TYPE_FLOAT64: return "g";
+        case CDB_TYPE_BOOL: return "b";
+        case CDB_TYPE_STRING: return "U";       /* large_utf8 (int64 offsets) */
+        case CDB_TYPE_STRING_DICT: return "i";  /* int32 indices into a large_utf8 dictionary */
+        default: return NULL;
+    }
+}
+
+/* Fill a schema with the given format; name may be NULL */
+static int init_arrow_schema(struct ArrowSchema* schema, const char* format, const char* name, int64_t flags) {
+    memset(schema, 0, sizeof(*schema));
+    if (name) {
+        size_t len = strlen(name) + 1;
+        char* copy = (char*)malloc(len);
+        if (!copy) return -1;
+        memcpy(copy, name, len);
+        schema->name = copy;
+    }
+    schema->format = format;
+    schema->flags = flags;
+    schema->release = release_arrow_schema;
+    return 0;
+}
+
+/* Start an array of the given length with n_buffers owned buffers (all NULL so far) */
+static int init_arrow_array(struct ArrowArray* array, int64_t length, int64_t n_buffers) {
+    memset(array, 0, sizeof(*array));
+    arrow_array_private_t* priv = (arrow_array_private_t*)calloc(1, sizeof(arrow_array_private_t));
+    if (!priv) return -1;
+    array->length = length;
+    array->n_buffers = n_buffers;
+    array->buffers = (const void**)priv->buffers;
+    array->private_data = priv;
+    array->release = release_arrow_array;
+    return 0;
+}
+
+/* Build a large_utf8 array from n C strings (NULL entries become empty strings) */
+static int export_strings(struct ArrowArray* array, char* const* strings, size_t n) {
+    if (init_arrow_array(array, (int64_t)n, 3) < 0) return -1;
+    arrow_array_private_t* priv = (arrow_array_private_t*)array->private_data;
+    
+    int64_t* offsets = (int64_t*)malloc((n + 1) * sizeof(int64_t));
+    if (!offsets) return -1;
+    priv->buffers[1] = offsets;
+    
+    offsets[0] = 0;
+    for (size_t i = 0; i < n; i++) {
+        offsets[i + 1] = offsets[i] + (int64_t)(strings[i] ? strlen(strings[i]) : 0);
+    }
+    
+    char* chars = (char*)malloc(offsets[n] ? (size_t)offsets[n] : 1);
+    if (!chars) return -1;
+    priv->buffers[2] = chars;
+    
+    for (size_t i = 0; i < n; i++) {
+        memcpy(chars + offsets[i], strings[i] ? strings[i] : "", (size_t)(offsets[i + 1] - offsets[i]));
+    }
+    return 0;
+}
+
+/*
+ * Export a snapshot of a column as an Arrow array. Values are copied once
+ * into buffers the array owns, so the result stays valid however the
+ * database changes afterwards. On failure the array may be partly built
+ * and must still be released.
+ */
+static int export_arrow_column(cdb_column_t* col, struct ArrowSchema* schema, struct ArrowArray* array) {
+    size_t n = col->num_rows;
+    
+    if (init_arrow_schema(schema, arrow_format(col->data_type), col->name, ARROW_FLAG_NULLABLE) < 0) {
+        return -1;
+    }
+    
+    if (col->data_type == CDB_TYPE_STRING) {
+        if (export_strings(array, (char* const*)col->data, n) < 0) return -1;
+    } else if (col->data_type == CDB_TYPE_STRING_DICT) {
+        if (init_arrow_array(array, (int64_t)n, 2) < 0) return -1;
+        arrow_array_private_t* priv = (arrow_array_private_t*)array->private_data;
+        
+        int32_t* indices = (int32_t*)malloc(n ? n * sizeof(int32_t) : 1);
+        if (!indices) return -1;
+        priv->buffers[1] = indices;
+        const uint32_t* codes = (const uint32_t*)col->data;
+        for (size_t i = 0; i < n; i++) {
+            indices[i] = (int32_t)codes[i];
+        }
+        
+        schema->dictionary = (struct ArrowSchema*)malloc(sizeof(struct ArrowSchema));
+        if (!schema->dictionary) return -1;
+        if (init_arrow_schema(schema->dictionary, "U", NULL, 0) < 0) {
+            free(schema->dictionary);
+            schema->dictionary = NULL;
+            return -1;
+        }
+        
+        array->dictionary = (struct ArrowArray*)malloc(sizeof(struct ArrowArray));
+        if (!array->dictionary) return -1;
+        if (export_strings(array->dictionary, col->dict->values, col->dict->size) < 0) {
+            if (array->dictionary->release) array->dictionary->release(array->dictionary);
+            free(array->dictionary);
+            array->dictionary = NULL;
+            return -1;
+        }
+    } else {
+        /* Fixed width; BOOL storage is already Arrow's LSB-first bit layout */
+        if (init_arrow_array(array, (int64_t)n, 2) < 0) return -1;
+        arrow_array_private_t* priv = (arrow_array_private_t*)array->private_data;
+        
+        size_t size = cdb_column_storage_size(col->data_type, n);
+        priv->buffers[1] = malloc(size ? size : 1);
+        if (!priv->buffers[1]) return -1;
+        memcpy(priv->buffers[1], col->data, size);
+    }
+    
+    /* Arrow validity bits are set for valid rows, the inverse of the NULL bitmap */
+    array->null_count = (int64_t)cdb_null_count(col);
+    if (array->null_count > 0) {
+        arrow_array_private_t* priv = (arrow_array_private_t*)array->private_data;
+        size_t bitmap_size = (n + 7) / 8;
+        uint8_t* validity = (uint8_t*)malloc(bitmap_size);
+        if (!validity) return -1;
+        for (size_t i = 0; i < bitmap_size; i++) {
+            validity[i] = (uint8_t)~col->null_bitmap[i];
+        }
+        priv->buffers[0] = validity;
+    }
+    
+    return 0;
+}
+
+static void arrow_schema_capsule_destructor(PyObject* capsule) {
+    struct ArrowSchema* schema = (struct ArrowSchema*)PyCapsule_GetPointer(capsule, "arrow_schema");
+    if (schema) {
+        if (schema->release) schema->release(schema);
+        free(schema);
+    }
+}
+
+static void arrow_array_capsule_destructor(PyObject* capsule) {
+    struct ArrowArray* array = (struct ArrowArray*)PyCapsule_GetPointer(capsule, "arrow_array");
+    if (array) {
+        if (array->release) array->release(array);
+        free(array);
+    }
+}
+
+/*
+ * Export a column through the Arrow C Data Interface.
+ *
+ * Returns a (schema, array) pair of PyCapsules named "arrow_schema" and
+ * "arrow_array", as expected from __arrow_c_array__.
+ */
+static PyObject* PyColumnDB_export_arrow(PyColumnDBObject* self, PyObject* args) {
+    ENSURE_IDLE(self);
+    
+    const char* column_name;
+    
+    if (!PyArg_ParseTuple(args, "s", &column_name)) {
+        return NULL;
+    }
+    
+    cdb_column_t* col = cdb_get_column(self->db, column_name);
+    if (!col) {
+        PyErr_SetString(PyExc_ValueError, cdb_get_error());
+        return NULL;
+    }
+    
+    struct ArrowSchema* schema = (struct ArrowSchema*)calloc(1, sizeof(struct ArrowSchema));
+    struct ArrowArray* array = (struct ArrowArray*)calloc(1, sizeof(struct ArrowArray));
+    if (!schema || !array || export_arrow_column(col, schema, array) < 0) {
+        if (schema && schema->release) schema->release(schema);
+        if (array && array->release) array->release(array);
+        free(schema);
+        free(array);
+        return PyErr_NoMemory();
+    }
+    
+    PyObject* schema_capsule = PyCapsule_New(schema, "arrow_schema", arrow_schema_capsule_destructor);
+    if (!schema_capsule) {
+        schema->release(schema);
+        array->release(array);
+        free(schema);
+        free(array);
+        return NULL;
+    }
+    
+    PyObject* array_capsule = PyCapsule_New(array, "arrow_array", arrow_array_capsule_destructor);
+    if (!array_capsule) {
+        Py_DECREF(schema_capsule);
+        array->release(array);
+        free(array);
+        return NULL;
+    }
+    
+    PyObject* result = PyTuple_Pack(2, schema_capsule, array_capsule);
+    Py_DECREF(schema_capsule);
+    Py_DECREF(array_capsule);
+    return result;
+}
+
 /* Methods table */
 static PyMethodDef PyColumnDB_methods[] = {
     {"add_column", (PyCFunction)PyColumnDB_add_column, METH_VARARGS, "Add a column to the database"},
+    {"add_columns", (PyCFunction)PyColumnDB_add_columns, METH_VARARGS, "Add several columns from (name, type) pairs"},
     {"insert_int32", (PyCFunction)PyColumnDB_insert_int32, METH_VARARGS, "Insert int32 value"},
     {"insert_int64", (PyCFunction)PyColumnDB_insert_int64, METH_VARARGS, "Insert int64 value"},
     {"insert_float32", (PyCFunction)PyColumnDB_insert_float32, METH_VARARGS, "Insert float32 value"},
@@ -317,10 +1650,35 @@ static PyMethodDef PyColumnDB_methods[] = {
     {"insert_string", (PyCFunction)PyColumnDB_insert_string, METH_VARARGS, "Insert string value"},
     {"insert_bool", (PyCFunction)PyColumnDB_insert_bool, METH_VARARGS, "Insert bool value"},
     {"insert_null", (PyCFunction)PyColumnDB_insert_null, METH_VARARGS, "Insert NULL value"},
+    {"get_column_id", (PyCFunction)PyColumnDB_get_column_id, METH_VARARGS, "Get a column's id for the *_by_id insert methods"},
+    {"insert_int32_by_id", (PyCFunction)PyColumnDB_insert_int32_by_id, METH_VARARGS, "Insert int32 value by column id"},
+    {"insert_int64_by_id", (PyCFunction)PyColumnDB_insert_int64_by_id, METH_VARARGS, "Insert int64 value by column id"},
+    {"insert_float32_by_id", (PyCFunction)PyColumnDB_insert_float32_by_id, METH_VARARGS, "Insert float32 value by column id"},
+    {"insert_float64_by_id", (PyCFunction)PyColumnDB_insert_float64_by_id, METH_VARARGS, "Insert float64 value by column id"},
+    {"insert_string_by_id", (PyCFunction)PyColumnDB_insert_string_by_id, METH_VARARGS, "Insert string value by column id"},
+    {"insert_bool_by_id", (PyCFunction)PyColumnDB_insert_bool_by_id, METH_VARARGS, "Insert bool value by column id"},
+    {"insert_null_by_id", (PyCFunction)PyColumnDB_insert_null_by_id, METH_VARARGS, "Insert NULL value by column id"},
+    {"insert_many_int32", (PyCFunction)PyColumnDB_insert_many_int32, METH_VARARGS, "Insert a sequence of int32 values"},
+    {"insert_many_int64", (PyCFunction)PyColumnDB_insert_many_int64, METH_VARARGS, "Insert a sequence of int64 values"},
+    {"insert_many_float32", (PyCFunction)PyColumnDB_insert_many_float32, METH_VARARGS, "Insert a sequence of float32 values"},
+    {"insert_many_float64", (PyCFunction)PyColumnDB_insert_many_float64, METH_VARARGS, "Insert a sequence of float64 values"},
+    {"insert_many_string", (PyCFunction)PyColumnDB_insert_many_string, METH_VARARGS, "Insert a sequence of string values"},
+    {"insert_many_bool", (PyCFunction)PyColumnDB_insert_many_bool, METH_VARARGS, "Insert a sequence of bool values"},
+    {"reserve", (PyCFunction)PyColumnDB_reserve, METH_VARARGS, "Reserve capacity for a number of rows"},
+    {"insert_buffer", (PyCFunction)PyColumnDB_insert_buffer, METH_VARARGS, "Append raw buffer contents to a numeric column"},
     {"get_num_rows", (PyCFunction)PyColumnDB_get_num_rows, METH_NOARGS, "Get number of rows"},
     {"get_num_columns", (PyCFunction)PyColumnDB_get_num_columns, METH_NOARGS, "Get number of columns"},
     {"get_column_data", (PyCFunction)PyColumnDB_get_column_data, METH_VARARGS, "Get column data as list"},
+    {"get_column_length", (PyCFunction)PyColumnDB_get_column_length, METH_VARARGS, "Get number of rows in a column"},
+    {"get_column_buffer", (PyCFunction)PyColumnDB_get_column_buffer, METH_VARARGS, "Get numeric column data as a typed memoryview"},
+    {"get_null_bitmap", (PyCFunction)PyColumnDB_get_null_bitmap, METH_VARARGS, "Get column null bitmap as bytes (None if no NULLs)"},
+    {"count_nulls", (PyCFunction)PyColumnDB_count_nulls, METH_VARARGS, "Count NULL values in a column"},
+    {"count_true", (PyCFunction)PyColumnDB_count_true, METH_VARARGS, "Count TRUE values in a bool column"},
+    {"get_dictionary", (PyCFunction)PyColumnDB_get_dictionary, METH_VARARGS, "Get codes and unique strings of a dictionary-encoded column"},
+    {"export_arrow", (PyCFunction)PyColumnDB_export_arrow, METH_VARARGS, "Export a column as Arrow C Data Interface (schema, array) capsules"},
+    {"get_all_columns", (PyCFunction)PyColumnDB_get_all_columns, METH_VARARGS, "Get all columns as a dict (lists, or buffers and null bitmaps)"},
     {"get_column_names", (PyCFunction)PyColumnDB_get_column_names, METH_NOARGS, "Get list of column names"},
+    {"get_column_types", (PyCFunction)PyColumnDB_get_column_types, METH_NOARGS, "Get list of column data types"},
     {"save", (PyCFunction)PyColumnDB_save, METH_VARARGS, "Save database to file"},
     {"load", (PyCFunction)PyColumnDB_load, METH_VARARGS, "Load database from file"},
     {NULL}
@@ -376,6 +1734,7 @@ PyMODINIT_FUNC PyInit_columndb(void) {
     PyModule_AddIntConstant(m, "TYPE_FLOAT64", CDB_TYPE_FLOAT64);
     PyModule_AddIntConstant(m, "TYPE_STRING", CDB_TYPE_STRING);
     PyModule_AddIntConstant(m, "TYPE_BOOL", CDB_TYPE_BOOL);
+    PyModule_AddIntConstant(m, "TYPE_STRING_DICT", CDB_TYPE_STRING_DICT);
     
     return m;
 }
@@ -2,16 +2,70 @@
 Unit tests for ColumnDB
 """
 
+import os
+import struct
+import sys
+import tempfile
+import threading
 import unittest
+
+import pytest
+
+import columndb
 from columndb import ColumnDB, DataType
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-class TestColumnDB(unittest.TestCase):
-    """Test ColumnDB functionality"""
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+# Every data type, with a column name for each
+ALL_DATA_TYPES = (
+    ("col_int32", DataType.INT32),
+    ("col_int64", DataType.INT64),
+    ("col_float32", DataType.FLOAT32),
+    ("col_float64", DataType.FLOAT64),
+    ("col_string", DataType.STRING),
+    ("col_bool", DataType.BOOL),
+)
+
+
+def write_v1_file(path, num_rows, columns, version=1):
+    """Write a .cdb file in the original version 1 layout.
     
-    def setUp(self):
-        """Create a fresh database for each test"""
-        self.db = ColumnDB()
+    columns is a sequence of (name, data_type, data, null_bitmap) with the
+    data and bitmap sections as raw bytes.
+    """
+    header = struct.pack("<IIIIQII", 0x43444201, version, len(columns), num_rows, 0, 0, 0)
+    directory = b"".join(
+        struct.pack("<BH", data_type, len(name)) + name.encode()
+        + struct.pack("<QQQ", 0, len(data), len(bitmap))
+        for name, data_type, data, bitmap in columns
+    )
+    sections = b"".join(data + bitmap for _, _, data, bitmap in columns)
+    size = len(header) + len(directory) + len(sections) + 16
+    with open(path, "wb") as f:
+        f.write(header + directory + sections + struct.pack("<IQI", 0x43444245, size, 0))
+
+
+class TestColumnDBReadOnly(unittest.TestCase):
+    """Test ColumnDB behaviour that leaves the database unchanged"""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Create one empty database shared by every test in the class"""
+        cls.db = ColumnDB()
     
     def test_create_database(self):
         """Test database creation"""
@@ -19,6 +73,29 @@ class TestColumnDB(unittest.TestCase):
         self.assertEqual(self.db.get_num_rows(), 0)
         self.assertEqual(self.db.get_num_columns(), 0)
     
+    def test_invalid_data_type(self):
+        """Test that invalid data types are rejected"""
+        with self.assertRaises(ValueError):
+            self.db.add_column("bad", 999)
+    
+    def test_insert_nonexistent_column(self):
+        """Test inserting to non-existent column raises error"""
+        with self.assertRaises(ValueError):
+            self.db.insert("nonexistent", 42)
+    
+    def test_get_nonexistent_column(self):
+        """Test getting non-existent column raises error"""
+        with self.assertRaises(ValueError):
+            self.db.get_column_data("nonexistent")
+
+
+class TestColumnDB(unittest.TestCase):
+    """Test ColumnDB functionality"""
+    
+    def setUp(self):
+        """Create a fresh database for each test"""
+        self.db = ColumnDB()
+    
     def test_add_column(self):
         """Test adding columns"""
         self.db.add_column("id", DataType.INT64)
@@ -27,6 +104,44 @@ class TestColumnDB(unittest.TestCase):
         self.db.add_column("name", DataType.STRING)
         self.assertEqual(self.db.get_num_columns(), 2)
     
+    def test_concurrent_save_and_insert(self):
+        """Test that saving from another thread doesn't race with inserts"""
+        self.db.add_column("id", DataType.INT64)
+        self.db.insert_many("id", range(100000))
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "data.cdb")
+            saver = threading.Thread(target=self.db.save, args=(path,))
+            saver.start()
+            for i in range(1000):
+                self.db.insert("id", 100000 + i)
+            saver.join()
+            
+            loaded = ColumnDB.load(path)
+            num_rows = loaded.get_num_rows()
+            self.assertGreaterEqual(num_rows, 100000)
+            self.assertEqual(loaded.get_column_data("id"), list(range(num_rows)))
+        
+        self.assertEqual(self.db.get_num_rows(), 101000)
+    
+    def test_add_columns(self):
+        """Test adding a whole schema at once"""
+        self.db.add_columns([("id", DataType.INT64), ("name", DataType.STRING)])
+        self.assertEqual(self.db.get_num_columns(), 2)
+        self.assertEqual(self.db.get_schema(), {"id": "int64", "name": "string"})
+        
+        self.db.insert("id", 1)
+        self.assertEqual(self.db.get_column_data("id"), [1])
+        
+        # Invalid batches add nothing
+        with self.assertRaises(ValueError):
+            self.db.add_columns([("a", DataType.INT32), ("a", DataType.BOOL)])
+        with self.assertRaises(ValueError):
+            self.db.add_columns([("b", DataType.INT32), ("id", DataType.BOOL)])
+        with self.assertRaises(ValueError):
+            self.db.add_columns([("c", 999)])
+        self.assertEqual(self.db.get_num_columns(), 2)
+    
     def test_duplicate_column_name(self):
         """Test that duplicate column names are rejected"""
         self.db.add_column("id", DataType.INT64)
@@ -34,84 +149,441 @@ class TestColumnDB(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.db.add_column("id", DataType.STRING)
     
-    def test_invalid_data_type(self):
-        """Test that invalid data types are rejected"""
+    def test_insert_null(self):
+        """Test inserting NULL values"""
+        self.db.add_column("nullable", DataType.STRING)
+        
+        self.db.insert("nullable", "value1")
+        self.db.insert("nullable", None)
+        self.db.insert("nullable", "value2")
+        
+        data = self.db.get_column_data("nullable")
+        self.assertEqual(data[0], "value1")
+        self.assertIsNone(data[1])
+        self.assertEqual(data[2], "value2")
+    
+    def test_count_nulls(self):
+        """Test counting NULLs across several 64-row bitmap words"""
+        self.db.add_column("value", DataType.INT64)
+        values = [None if i % 3 == 0 else i for i in range(200)]
+        self.db.insert_many("value", values)
+        
+        self.assertEqual(self.db.count_nulls("value"), values.count(None))
+        self.assertEqual(self.db.get_column_data("value"), values)
+        
         with self.assertRaises(ValueError):
-            self.db.add_column("bad", 999)
+            self.db.count_nulls("nonexistent")
+    
+    def test_bool_bit_packing(self):
+        """Test bool columns across word boundaries, with NULLs and count_true"""
+        self.db.add_column("flag", DataType.BOOL)
+        values = [None if i % 10 == 0 else i % 3 == 0 for i in range(150)]
+        self.db.insert_many("flag", values[:70])
+        for value in values[70:]:
+            self.db.insert("flag", value)
+        
+        self.assertEqual(self.db.get_column_data("flag"), values)
+        self.assertEqual(self.db.count_true("flag"), values.count(True))
+        self.assertEqual(
+            self.db.get_column_data("flag", as_buffer=True).tolist(),
+            [bool(v) for v in values],
+        )
+        
+        self.db.add_column("id", DataType.INT32)
+        with self.assertRaises(TypeError):
+            self.db.count_true("id")
+    
+    def test_insert_many(self):
+        """Test bulk inserting a sequence of values"""
+        self.db.add_column("id", DataType.INT64)
+        self.db.add_column("name", DataType.STRING)
+        self.db.add_column("score", DataType.FLOAT32)
+        self.db.add_column("flag", DataType.BOOL)
+        
+        self.db.insert_many("id", [1, 2, 3])
+        self.db.insert_many("name", ["a", None, "c"])
+        self.db.insert_many("score", (1.5, 2, None))
+        self.db.insert_many("flag", [True, False, 1])
+        
+        self.assertEqual(self.db.get_num_rows(), 3)
+        self.assertEqual(self.db.get_column_data("id"), [1, 2, 3])
+        self.assertEqual(self.db.get_column_data("name"), ["a", None, "c"])
+        self.assertEqual(self.db.get_column_data("score"), [1.5, 2.0, None])
+        self.assertEqual(self.db.get_column_data("flag"), [True, False, True])
+    
+    def test_insert_batch(self):
+        """Test bulk inserting a large batch in a single call"""
+        self.db.add_column("id", DataType.INT64)
+        values = list(range(1, 10001))
+        self.db.insert_many("id", values)
+        
+        self.assertEqual(self.db.get_num_rows(), 10000)
+        self.assertEqual(self.db.get_column_data("id"), values)
     
-    def test_insert_int32(self):
-        """Test inserting int32 values"""
+    def test_insert_many_is_atomic(self):
+        """Test that a failed bulk insert leaves the column unchanged"""
         self.db.add_column("value", DataType.INT32)
+        self.db.insert("value", 7)
         
-        self.db.insert("value", 42)
-        self.db.insert("value", -100)
+        with self.assertRaises(ValueError):
+            self.db.insert_many("value", [1, None, "not a number"])
+        with self.assertRaises(OverflowError):
+            self.db.insert_many("value", [1, 2**40])
         
-        self.assertEqual(self.db.get_num_rows(), 2)
-        data = self.db.get_column_data("value")
-        self.assertEqual(data, [42, -100])
+        self.assertEqual(self.db.get_column_data("value"), [7])
+        self.assertEqual(self.db.count_nulls("value"), 0)
+        self.assertIsNone(self.db._db.get_null_bitmap("value"))
+        self.db.insert_many("value", [8])
+        self.assertEqual(self.db.get_column_data("value"), [7, 8])
+
+    def test_insert_many_reentrant(self):
+        """Test bulk inserts whose value conversions modify the database"""
+        db = self.db
+        db.add_column("value", DataType.INT64)
+        db.add_column("name", DataType.STRING)
+
+        class Meddler:
+            """Converts to 5 or "five" after growing the database and the input"""
+            def __init__(self, values):
+                self.values = values
+
+            def meddle(self):
+                db.insert_many("value", range(1000))
+                db.insert_many("name", ["x"] * 1000)
+                # Enough columns to move the column table
+                first = db.get_num_columns()
+                db.add_columns([(f"extra{first + i}", DataType.INT32) for i in range(50)])
+                self.values.clear()
+
+            def __index__(self):
+                self.meddle()
+                return 5
+
+            __int__ = __index__
+
+            def __str__(self):
+                self.meddle()
+                return "five"
+
+        values = [1, None]
+        values.append(Meddler(values))
+        db.insert_many("value", values)
+        self.assertEqual(db.get_column_data("value"), list(range(1000)) + [1, None, 5])
+
+        values = ["a", None]
+        values.append(Meddler(values))
+        db.insert_many("name", values)
+        self.assertEqual(db.get_column_data("name")[-3:], ["a", None, "five"])
+        self.assertEqual(len(db.get_column_data("name")), 2003)
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_insert_array(self):
+        """Test appending NumPy arrays to numeric columns"""
+        self.db.add_column("id", DataType.INT32)
+        self.db.add_column("price", DataType.FLOAT64)
+        self.db.add_column("flag", DataType.BOOL)
+        self.db.add_column("name", DataType.STRING)
+        
+        self.db.insert("id", 1)
+        self.db.insert_array("id", np.array([2, 3], dtype=np.int64))
+        self.db.insert_array("price", np.arange(3, dtype=np.float64)[::-1])
+        self.db.insert_array("flag", [True, False, True])
+        
+        self.assertEqual(self.db.get_column_data("id"), [1, 2, 3])
+        self.assertEqual(self.db.get_column_data("price"), [2.0, 1.0, 0.0])
+        self.assertEqual(self.db.get_column_data("flag"), [True, False, True])
+        
+        with self.assertRaises(TypeError):
+            self.db.insert_array("id", np.array([1.5]))
+        with self.assertRaises(ValueError):
+            self.db.insert_array("name", np.array(["x"]))
+
+    @unittest.skipIf(sys.version_info < (3, 12), "__buffer__ needs Python 3.12+")
+    def test_insert_buffer_reentrant(self):
+        """Test a buffer export that moves the column table before the copy"""
+        db = self.db
+        db.add_column("value", DataType.INT64)
+        
+        class Exporter:
+            def __buffer__(self, flags):
+                db.add_columns([(f"extra{i}", DataType.INT32) for i in range(50)])
+                return memoryview(struct.pack("<2q", 1, 2))
+        
+        db._db.insert_buffer("value", DataType.INT64, Exporter())
+        self.assertEqual(db.get_column_data("value"), [1, 2])
     
-    def test_insert_int64(self):
-        """Test inserting int64 values"""
-        self.db.add_column("big_num", DataType.INT64)
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_insert_array_out_of_range(self):
+        """Test that narrowing casts reject values the column cannot hold"""
+        self.db.add_column("id", DataType.INT32)
+        self.db.add_column("ratio", DataType.FLOAT32)
+
+        with self.assertRaises(OverflowError):
+            self.db.insert_array("id", np.array([2**40]))
+        with self.assertRaises(OverflowError):
+            self.db.insert_array("id", np.array([1, -2**31 - 1], dtype=np.int64))
+        with self.assertRaises(OverflowError):
+            self.db.insert_array("ratio", np.array([1e300]))
+        self.assertEqual(self.db.get_column_data("id"), [])
+        self.assertEqual(self.db.get_column_data("ratio"), [])
+
+        self.db.insert_array("id", np.array([2**31 - 1, -2**31], dtype=np.int64))
+        self.db.insert_array("ratio", np.array([0.5, np.inf]))
+        self.assertEqual(self.db.get_column_data("id"), [2**31 - 1, -2**31])
+        self.assertEqual(self.db.get_column_data("ratio"), [0.5, float("inf")])
+
+    def test_get_column_data_as_buffer(self):
+        """Test retrieving a numeric column as a typed memoryview"""
+        self.db.add_column("value", DataType.INT64)
+        self.db.add_column("text", DataType.STRING)
+        self.db.insert_many("value", [1, None, 3])
         
-        self.db.insert("big_num", 9223372036854775807)  # Max int64
+        buf = self.db.get_column_data("value", as_buffer=True)
+        self.assertEqual(buf.format, "q")
+        self.assertTrue(buf.readonly)
+        self.assertEqual(buf.tolist(), [1, 0, 3])
         
-        data = self.db.get_column_data("big_num")
-        self.assertEqual(data[0], 9223372036854775807)
+        # The snapshot is refreshed once the column grows
+        self.db.insert("value", 4)
+        buf = self.db.get_column_data("value", as_buffer=True)
+        self.assertEqual(buf.tolist(), [1, 0, 3, 4])
+        
+        with self.assertRaises(TypeError):
+            self.db.get_column_data("text", as_buffer=True)
     
-    def test_insert_float32(self):
-        """Test inserting float32 values"""
-        self.db.add_column("value", DataType.FLOAT32)
+    def test_compile_row_inserter(self):
+        """Test inserting rows through a generated row inserter"""
+        self.db.add_columns([
+            ("id", DataType.INT64),
+            ("name", DataType.STRING),
+            ("score", DataType.FLOAT64),
+        ])
+        insert_row = self.db.compile_row_inserter(["id", "name", "score"])
+        insert_row((1, "Alice", 9.5))
+        insert_row((2, None, "7"))
         
-        self.db.insert("value", 3.14)
-        self.db.insert("value", -2.71)
+        self.assertEqual(self.db.to_dict(), {
+            "id": [1, 2],
+            "name": ["Alice", None],
+            "score": [9.5, 7.0],
+        })
         
-        data = self.db.get_column_data("value")
-        self.assertAlmostEqual(data[0], 3.14, places=2)
-        self.assertAlmostEqual(data[1], -2.71, places=2)
+        with self.assertRaises(ValueError):
+            insert_row((3, "Bob"))
+        with self.assertRaises(ValueError):
+            self.db.compile_row_inserter(["id", "nonexistent"])
     
-    def test_insert_float64(self):
-        """Test inserting float64 values"""
-        self.db.add_column("value", DataType.FLOAT64)
+    def test_insert_by_column_id(self):
+        """Test the C extension's id-based insert methods"""
+        self.db.add_columns([("id", DataType.INT64), ("name", DataType.STRING)])
+        raw = self.db._db
+        name_id = raw.get_column_id("name")
+        self.assertEqual(name_id, 1)
         
-        self.db.insert("value", 3.14159265358979)
+        raw.insert_string_by_id(name_id, "Alice")
+        raw.insert_null_by_id(name_id)
+        raw.insert_int64_by_id(raw.get_column_id("id"), 7)
+        self.assertEqual(self.db.get_column_data("name"), ["Alice", None])
+        self.assertEqual(self.db.get_column_data("id"), [7])
         
-        data = self.db.get_column_data("value")
-        self.assertAlmostEqual(data[0], 3.14159265358979, places=10)
+        with self.assertRaises(ValueError):
+            raw.get_column_id("nonexistent")
+        with self.assertRaises(RuntimeError):
+            raw.insert_int64_by_id(name_id, 1)
+        with self.assertRaises(RuntimeError):
+            raw.insert_null_by_id(5)
     
-    def test_insert_string(self):
-        """Test inserting string values"""
-        self.db.add_column("text", DataType.STRING)
+    def test_reserve(self):
+        """Test pre-allocating rows before inserting"""
+        self.db.add_column("id", DataType.INT32)
+        self.db.add_column("name", DataType.STRING)
+        
+        self.db.reserve(1000)
+        self.db.reserve(2000, "name")
+        self.assertEqual(self.db.get_num_rows(), 0)
         
-        self.db.insert("text", "hello")
-        self.db.insert("text", "world")
+        for i in range(1000):
+            self.db.insert("id", i)
+        self.assertEqual(self.db.get_column_data("id"), list(range(1000)))
         
-        data = self.db.get_column_data("text")
-        self.assertEqual(data, ["hello", "world"])
+        with self.assertRaises(ValueError):
+            self.db.reserve(10, "nonexistent")
+        with self.assertRaises(ValueError):
+            self.db.reserve(-1)
     
-    def test_insert_bool(self):
-        """Test inserting bool values"""
-        self.db.add_column("flag", DataType.BOOL)
+    def test_save_load_roundtrip(self):
+        """Test saving and loading a database larger than the initial capacity"""
+        self.db.add_column("id", DataType.INT64)
+        self.db.add_column("name", DataType.STRING)
+        self.db.insert_many("id", range(100))
+        self.db.insert_many("name", [None if i % 7 == 0 else f"n{i}" for i in range(100)])
         
-        self.db.insert("flag", True)
-        self.db.insert("flag", False)
-        self.db.insert("flag", True)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "data.cdb")
+            self.db.save(path)
+            loaded = ColumnDB.load(path)
+            
+            self.assertEqual(loaded.get_num_rows(), 100)
+            self.assertEqual(loaded.get_column_data("id"), list(range(100)))
+            self.assertEqual(loaded.get_column_data("name"), self.db.get_column_data("name"))
+            
+            # Loaded columns can still be appended to
+            loaded.insert("id", 100)
+            loaded.insert("name", None)
+            self.assertEqual(loaded.get_column_data("id"), list(range(101)))
+            self.assertIsNone(loaded.get_column_data("name")[-1])
+            
+            # The constructor loads an existing file, and starts empty otherwise
+            self.assertEqual(ColumnDB(path).get_column_data("id"), list(range(100)))
+            self.assertEqual(ColumnDB(os.path.join(tmp, "new.cdb")).get_num_columns(), 0)
+            with self.assertRaises(FileNotFoundError):
+                ColumnDB.load(os.path.join(tmp, "new.cdb"))
+            
+            with open(path, "rb") as f:
+                truncated = f.read()[:60]
+            with open(path, "wb") as f:
+                f.write(truncated)
+            with self.assertRaises(OSError):
+                ColumnDB.load(path)
+            with self.assertRaises(OSError):
+                ColumnDB(path)
+            with self.assertRaises(OSError):
+                self.db.save(os.path.join(tmp, "missing", "data.cdb"))
+    
+    def test_save_over_loaded_file(self):
+        """Test saving a loaded database back to the file it was loaded from"""
+        self.db.add_columns([
+            ("id", DataType.INT32),
+            ("name", DataType.STRING),
+            ("flag", DataType.BOOL),
+            ("score", DataType.FLOAT64),
+        ])
+        self.db.insert_many("id", [10, 11, 12])
+        self.db.insert_many("name", ["a", None, "c"])
+        self.db.insert_many("flag", [True, None, False])
+        self.db.insert_many("score", [1.5, 2.5, None])
+        expected = self.db.to_dict()
         
-        data = self.db.get_column_data("flag")
-        self.assertEqual(data, [True, False, True])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "data.cdb")
+            self.db.save(path)
+            
+            for open_db in (ColumnDB, ColumnDB.load):
+                loaded = open_db(path)
+                loaded.save(path)
+                self.assertEqual(loaded.to_dict(), expected)
+                self.assertEqual(ColumnDB.load(path).to_dict(), expected)
+
+    def test_save_over_file_loaded_elsewhere(self):
+        """Test replacing a file another database still has loaded"""
+        self.db.add_column("a", DataType.INT64)
+        self.db.insert_many("a", range(100000))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "data.cdb")
+            self.db.save(path)
+            os.chmod(path, 0o640)
+            loaded = ColumnDB.load(path)
+
+            # Both a smaller and a same-size file replace it
+            for values in ([1], range(100000, 200000)):
+                other = ColumnDB()
+                other.add_column("a", DataType.INT64)
+                other.insert_many("a", values)
+                other.save(path)
+
+                self.assertEqual(loaded.get_column_data("a"), list(range(100000)))
+                self.assertEqual(ColumnDB.load(path).get_column_data("a"), list(values))
+
+            self.assertEqual(os.stat(path).st_mode & 0o777, 0o640)
+            self.assertEqual(os.listdir(tmp), ["data.cdb"])
     
-    def test_insert_null(self):
-        """Test inserting NULL values"""
-        self.db.add_column("nullable", DataType.STRING)
+    def test_load_version_1_file(self):
+        """Test loading a file in the original format, and rejecting others"""
+        names = b"".join(struct.pack("<I", len(v)) + v for v in (b"a", b"", b"c"))
+        # Version 1 left whatever was in memory under NULL rows
+        columns = [
+            ("id", DataType.INT32, struct.pack("<3i", 1, 22002, 3), b"\x02"),
+            ("name", DataType.STRING, names, b"\x02"),
+            ("score", DataType.FLOAT64, struct.pack("<3d", 3e-41, 0.5, 1.5), b"\x01"),
+            ("flag", DataType.BOOL, bytes([1, 0, 1]), b"\x04"),
+        ]
         
-        self.db.insert("nullable", "value1")
-        self.db.insert("nullable", None)
-        self.db.insert("nullable", "value2")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "v1.cdb")
+            write_v1_file(path, 3, columns)
+            loaded = ColumnDB.load(path)
+            self.assertEqual(loaded.to_dict(), {
+                "id": [1, None, 3],
+                "name": ["a", None, "c"],
+                "score": [None, 0.5, 1.5],
+                "flag": [True, False, None],
+            })
+            self.assertEqual(loaded.count_true("flag"), 1)
+            
+            # NULL rows read as 0 from the raw buffers
+            buffers = {name: loaded.get_column_data(name, as_buffer=True).tolist()
+                       for name in ("id", "score", "flag")}
+            self.assertEqual(buffers, {
+                "id": [1, 0, 3], "score": [0.0, 0.5, 1.5], "flag": [True, False, False],
+            })
+            
+            # Version 2 was never released, and version 1 had no STRING_DICT
+            write_v1_file(path, 3, columns, version=2)
+            with self.assertRaises(OSError):
+                ColumnDB.load(path)
+            write_v1_file(path, 3, columns + [("dept", DataType.STRING_DICT, b"", b"\x00")])
+            with self.assertRaises(OSError):
+                ColumnDB.load(path)
+    
+    def test_save_load_large(self):
+        """Test a round trip big enough to take the parallel save path"""
+        n = 100000
+        self.db.add_columns([
+            ("id", DataType.INT64),
+            ("name", DataType.STRING),
+            ("dept", DataType.STRING_DICT),
+            ("flag", DataType.BOOL),
+            ("score", DataType.FLOAT64),
+        ])
+        self.db.insert_many("id", range(n))
+        self.db.insert_many("name", [None if i % 11 == 0 else f"name{i}" for i in range(n)])
+        self.db.insert_many("dept", [None if i % 13 == 0 else f"d{i % 5}" for i in range(n)])
+        self.db.insert_many("flag", [None if i % 17 == 0 else i % 3 == 0 for i in range(n)])
+        self.db.insert_many("score", [None if i % 19 == 0 else i * 0.5 for i in range(n)])
+        expected = self.db.to_dict()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "large.cdb")
+            self.db.save(path)
+            self.assertGreater(os.path.getsize(path), 1 << 20)
+            self.assertEqual(ColumnDB.load(path).to_dict(), expected)
+
+    def test_string_dict(self):
+        """Test dictionary-encoded string columns"""
+        self.db.add_column("dept", DataType.STRING_DICT)
+        self.db.insert("dept", "Sales")
+        self.db.insert_many("dept", ["HR", "Sales", None, "HR"])
         
-        data = self.db.get_column_data("nullable")
-        self.assertEqual(data[0], "value1")
-        self.assertIsNone(data[1])
-        self.assertEqual(data[2], "value2")
+        self.assertEqual(self.db.get_column_data("dept"), ["Sales", "HR", "Sales", None, "HR"])
+        self.assertEqual(self.db.get_schema()["dept"], "string_dict")
+        
+        codes, categories = self.db._db.get_dictionary("dept")
+        self.assertEqual(categories, ["Sales", "HR"])
+        self.assertEqual(codes.format, "I")
+        self.assertEqual(codes.tolist()[:3], [0, 1, 0])
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "dict.cdb")
+            self.db.save(path)
+            loaded = ColumnDB.load(path)
+        self.assertEqual(loaded.get_column_data("dept"), ["Sales", "HR", "Sales", None, "HR"])
+        
+        if pd is not None:
+            df = self.db.to_pandas()
+            self.assertEqual(str(df["dept"].dtype), "category")
+            self.assertEqual(list(df["dept"].cat.categories), ["Sales", "HR"])
+            self.assertTrue(pd.isna(df["dept"][3]))
     
     def test_multiple_columns(self):
         """Test database with multiple columns"""
@@ -119,15 +591,9 @@ class TestColumnDB(unittest.TestCase):
         self.db.add_column("name", DataType.STRING)
         self.db.add_column("score", DataType.FLOAT64)
         
-        # Insert row 1
-        self.db.insert("id", 1)
-        self.db.insert("name", "Alice")
-        self.db.insert("score", 95.5)
-        
-        # Insert row 2
-        self.db.insert("id", 2)
-        self.db.insert("name", "Bob")
-        self.db.insert("score", 87.3)
+        self.db.insert_many("id", [1, 2])
+        self.db.insert_many("name", ["Alice", "Bob"])
+        self.db.insert_many("score", [95.5, 87.3])
         
         self.assertEqual(self.db.get_num_rows(), 2)
         self.assertEqual(self.db.get_num_columns(), 3)
@@ -155,25 +621,67 @@ class TestColumnDB(unittest.TestCase):
         self.db.add_column("id", DataType.INT32)
         self.db.add_column("value", DataType.STRING)
         
-        self.db.insert("id", 1)
-        self.db.insert("value", "a")
-        self.db.insert("id", 2)
-        self.db.insert("value", "b")
+        self.db.insert_many("id", [1, 2])
+        self.db.insert_many("value", ["a", "b"])
         
         data_dict = self.db.to_dict()
         
         self.assertEqual(data_dict["id"], [1, 2])
         self.assertEqual(data_dict["value"], ["a", "b"])
     
-    def test_insert_nonexistent_column(self):
-        """Test inserting to non-existent column raises error"""
-        with self.assertRaises(ValueError):
-            self.db.insert("nonexistent", 42)
+    @unittest.skipIf(pd is None, "pandas not installed")
+    def test_to_pandas(self):
+        """Test converting database to a DataFrame, including NULLs"""
+        self.db.add_columns([
+            ("id", DataType.INT64),
+            ("age", DataType.INT32),
+            ("name", DataType.STRING),
+            ("flag", DataType.BOOL),
+        ])
+        self.db.insert_many("id", [1, 2, 3])
+        self.db.insert_many("age", [30, None, 40])
+        self.db.insert_many("name", ["a", "b", None])
+        self.db.insert_many("flag", [True, None, False])
+        
+        df = self.db.to_pandas()
+        
+        self.assertEqual(list(df.columns), ["id", "age", "name", "flag"])
+        self.assertEqual(str(df["id"].dtype), "int64")
+        self.assertEqual(df["id"].tolist(), [1, 2, 3])
+        self.assertEqual(str(df["age"].dtype), "Int32")
+        self.assertEqual(df["age"].isna().tolist(), [False, True, False])
+        self.assertEqual(df["age"][2], 40)
+        self.assertEqual(str(df["flag"].dtype), "boolean")
+        self.assertTrue(pd.isna(df["name"][2]))
+        
+        # Columns are backed by writable buffers
+        df.loc[0, "id"] = 10
+        self.assertEqual(df["id"].tolist(), [10, 2, 3])
+        self.assertEqual(self.db.get_column_data("id"), [1, 2, 3])
     
-    def test_get_nonexistent_column(self):
-        """Test getting non-existent column raises error"""
-        with self.assertRaises(ValueError):
-            self.db.get_column_data("nonexistent")
+    @unittest.skipIf(pa is None, "pyarrow not installed")
+    def test_to_arrow(self):
+        """Test exporting the database as a pyarrow Table"""
+        self.db.add_columns([
+            ("id", DataType.INT64),
+            ("score", DataType.FLOAT32),
+            ("name", DataType.STRING),
+            ("dept", DataType.STRING_DICT),
+            ("flag", DataType.BOOL),
+        ])
+        self.db.insert_many("id", [1, 2, 3])
+        self.db.insert_many("score", [1.5, None, 3.5])
+        self.db.insert_many("name", ["a", None, "c"])
+        self.db.insert_many("dept", ["x", "y", None])
+        self.db.insert_many("flag", [True, False, None])
+        
+        table = self.db.to_arrow()
+        
+        self.assertEqual(table.column_names, ["id", "score", "name", "dept", "flag"])
+        self.assertEqual(table.schema.field("id").type, pa.int64())
+        self.assertEqual(table.schema.field("name").type, pa.large_string())
+        self.assertTrue(pa.types.is_dictionary(table.schema.field("dept").type))
+        self.assertEqual(table.to_pydict(), self.db.to_dict())
     
     def test_repr(self):
         """Test string representation"""
@@ -186,6 +694,67 @@ class TestColumnDB(unittest.TestCase):
         self.assertIn("columns=1", repr_str)
 
 
+@pytest.fixture(params=["cython", "python"])
+def db(request, monkeypatch):
+    """Create a fresh database for a single test, once per insert() backend"""
+    if request.param == "cython":
+        if columndb._InsertDispatcher is None:
+            pytest.skip("compiled insert dispatcher not built")
+    else:
+        monkeypatch.setattr(columndb, "_InsertDispatcher", None)
+    return ColumnDB()
+
+
+@pytest.mark.parametrize("dtype,values,places", [
+    pytest.param(DataType.INT32, [42, -100], None, id="int32"),
+    pytest.param(DataType.INT64, [9223372036854775807], None, id="int64"),  # Max int64
+    pytest.param(DataType.FLOAT32, [3.14, -2.71], 2, id="float32"),
+    pytest.param(DataType.FLOAT64, [3.14159265358979], 10, id="float64"),
+    pytest.param(DataType.STRING, ["hello", "world"], None, id="string"),
+    pytest.param(DataType.BOOL, [True, False, True], None, id="bool"),
+])
+def test_insert_scalar(db, dtype, values, places):
+    """Test inserting values of each data type one at a time"""
+    db.add_column("value", dtype)
+    for value in values:
+        db.insert("value", value)
+    
+    assert db.get_num_rows() == len(values)
+    data = db.get_column_data("value")
+    if places is None:
+        assert data == values
+    else:
+        assert data == pytest.approx(values, abs=0.5 * 10 ** -places)
+
+
+@pytest.mark.parametrize("column_name", ["missing", 42, None])
+def test_insert_unknown_column(db, column_name):
+    """Test that both insert() backends reject unknown column names alike"""
+    db.add_column("value", DataType.INT64)
+    with pytest.raises(ValueError):
+        db.insert(column_name, 1)
+    assert db.get_num_rows() == 0
+
+
+def test_insert_subclass_override(db):
+    """Test that a subclass's insert() is not replaced by the fast path"""
+    class LoggingColumnDB(ColumnDB):
+        def __init__(self):
+            self.inserted = []
+            super().__init__()
+
+        def insert(self, column_name, value):
+            self.inserted.append((column_name, value))
+            super().insert(column_name, value)
+
+    logged = LoggingColumnDB()
+    logged.add_column("value", DataType.INT64)
+    logged.insert("value", 7)
+    logged.insert("value", None)
+    assert logged.inserted == [("value", 7), ("value", None)]
+    assert logged.get_column_data("value") == [7, None]
+
+
 class TestDataTypes(unittest.TestCase):
     """Test all supported data types"""
     
@@ -193,19 +762,10 @@ class TestDataTypes(unittest.TestCase):
         """Test that all data types can be added and used"""
         db = ColumnDB()
         
-        types = [
-            ("col_int32", DataType.INT32),
-            ("col_int64", DataType.INT64),
-            ("col_float32", DataType.FLOAT32),
-            ("col_float64", DataType.FLOAT64),
-            ("col_string", DataType.STRING),
-            ("col_bool", DataType.BOOL),
-        ]
-        
-        for col_name, col_type in types:
+        for col_name, col_type in ALL_DATA_TYPES:
             db.add_column(col_name, col_type)
         
-        self.assertEqual(db.get_num_columns(), len(types))
+        self.assertEqual(db.get_num_columns(), len(ALL_DATA_TYPES))
 
 
 if __name__ == "__main__":
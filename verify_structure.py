@@ -5,7 +5,9 @@ Run this script to verify the complete project setup
 """
 
 import os
+import posixpath
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Define expected structure
@@ -52,6 +54,22 @@ EXPECTED_STRUCTURE = {
     }
 }
 
+def _index_tree(base, paths):
+    """
+    Map relative paths to os.DirEntry objects for every entry of the
+    directories that contain `paths`, with one scandir per directory
+    rather than a stat per expected path.
+    """
+    index = {}
+    for directory in {posixpath.dirname(path) for path in paths}:
+        try:
+            with os.scandir(os.path.join(base, directory)) as entries:
+                for entry in entries:
+                    index[posixpath.join(directory, entry.name)] = entry
+        except OSError:
+            pass
+    return index
+
 def verify_structure(base_path):
     """Verify the project structure"""
     
@@ -60,36 +78,50 @@ def verify_structure(base_path):
     
     base = Path(base_path)
     all_good = True
+    index = _index_tree(base, [*EXPECTED_STRUCTURE['directories'], *EXPECTED_STRUCTURE['files']])
+    # Built once; the statistics below only count expected files
+    paths = {file_path: base / file_path for file_path in EXPECTED_STRUCTURE['files']}
     
     # Check directories
     print("\n📁 Checking Directories:")
     for dir_name in EXPECTED_STRUCTURE['directories']:
-        dir_path = base / dir_name
-        status = "✅" if dir_path.is_dir() else "❌"
+        entry = index.get(dir_name)
+        is_dir = entry is not None and entry.is_dir()
+        status = "✅" if is_dir else "❌"
         print(f"  {status} {dir_name}")
-        if not dir_path.is_dir():
+        if not is_dir:
             all_good = False
     
     # Check files
     print("\n📄 Checking Files:")
     for file_path, description in EXPECTED_STRUCTURE['files'].items():
-        full_path = base / file_path
-        status = "✅" if full_path.is_file() else "❌"
-        size = f"({full_path.stat().st_size} bytes)" if full_path.is_file() else "(missing)"
+        entry = index.get(file_path)
+        is_file = entry is not None and entry.is_file()
+        status = "✅" if is_file else "❌"
+        size = f"({entry.stat().st_size} bytes)" if is_file else "(missing)"
         print(f"  {status} {file_path:35} {size:20} # {description}")
-        if not full_path.is_file():
+        if not is_file:
             all_good = False
     
+    # Line counts read whole files, so they are overlapped on a thread pool
+    pool = ThreadPoolExecutor(max_workers=8)
+    
     # Count lines of code
     print("\n📊 Code Statistics:")
     
     def count_lines(filepath):
-        """Count lines in a file"""
+        """Count lines in a file, counting newlines in 64 KiB binary chunks"""
+        total = 0
+        last = b'\n'
         try:
-            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                return len(f.readlines())
-        except:
+            with open(filepath, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 16), b''):
+                    total += chunk.count(b'\n')
+                    last = chunk[-1:]
+        except OSError:
             return 0
+        # A final line without a trailing newline still counts
+        return total + (last != b'\n')
     
     # C code
     c_files = {
@@ -99,9 +131,8 @@ def verify_structure(base_path):
     }
     
     total_c_lines = 0
-    for file_path, label in c_files.items():
-        full_path = base / file_path
-        lines = count_lines(full_path)
+    c_counts = pool.map(count_lines, [paths[file_path] for file_path in c_files])
+    for label, lines in zip(c_files.values(), c_counts):
         total_c_lines += lines
         print(f"  🔧 {label:20} {lines:5} lines")
     
@@ -113,12 +144,13 @@ def verify_structure(base_path):
     }
     
     total_py_lines = 0
-    for file_path, label in py_files.items():
-        full_path = base / file_path
-        lines = count_lines(full_path)
+    py_counts = pool.map(count_lines, [paths[file_path] for file_path in py_files])
+    for label, lines in zip(py_files.values(), py_counts):
         total_py_lines += lines
         print(f"  🐍 {label:20} {lines:5} lines")
     
+    pool.shutdown()
+    
     print(f"\n  Total C Code:      {total_c_lines:5} lines")
     print(f"  Total Python Code: {total_py_lines:5} lines")
     print(f"  Total Code:        {total_c_lines + total_py_lines:5} lines")